@@ -3,7 +3,7 @@ Database module initialization
 """
 
 from .database import get_db, SessionLocal, engine, Base, init_db, test_connection
-from .models import Hero, MatchHistory, PlayerPreference
+from .models import Hero, MatchHistory, MatchParticipant, PlayerPreference
 
 __all__ = [
     "get_db",
@@ -14,5 +14,6 @@ __all__ = [
     "test_connection",
     "Hero",
     "MatchHistory", 
+    "MatchParticipant",
     "PlayerPreference"
 ]
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Bulk write helpers - set-based hero upserts for the data loaders and the
+match participant backfill
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import func, literal, literal_column, null, select, true, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from .models import Hero, MatchHistory, MatchParticipant
+
+# Columns an upsert row may carry besides the name
+HERO_UPSERT_COLUMNS = ("image", "stats_json", "meta_json")
+
+# Transaction-level advisory lock serializing participant backfills
+PARTICIPANT_BACKFILL_LOCK_ID = 711_001
+
+
+def upsert_heroes(db: Session, rows: List[Dict[str, Any]]) -> Dict[str, bool]:
+    """
+    Insert or update heroes by name in a single INSERT ... ON CONFLICT
+    statement (PostgreSQL).
+
+    Each row is {"name": ..., plus any of HERO_UPSERT_COLUMNS}. A column that
+    is missing or None leaves an existing hero's value untouched (new heroes
+    get NULL). Rows sharing a name collapse to the last one, as applying
+    them one by one would.
+
+    Does not commit.
+
+    Returns:
+        {hero name: True if inserted, False if updated}
+    """
+    if not rows:
+        return {}
+
+    unique_rows = {row["name"]: row for row in rows}
+    values = [
+        {
+            "name": name,
+            **{
+                column: null() if row.get(column) is None else row[column]
+                for column in HERO_UPSERT_COLUMNS
+            },
+        }
+        for name, row in unique_rows.items()
+    ]
+
+    stmt = insert(Hero).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Hero.name],
+        set_={
+            **{
+                column: func.coalesce(
+                    getattr(stmt.excluded, column), getattr(Hero, column)
+                )
+                for column in HERO_UPSERT_COLUMNS
+            },
+            # onupdate defaults do not apply to ON CONFLICT DO UPDATE
+            "updated_at": datetime.utcnow(),
+        },
+    ).returning(Hero.name, literal_column("xmax = 0"))
+
+    return {name: inserted for name, inserted in db.execute(stmt).all()}
+
+
+def backfill_match_participants(db: Session) -> int:
+    """
+    Fan out the compositions of matches that have no MatchParticipant rows
+    yet (recorded before the table existed) in one INSERT ... SELECT.
+
+    A one-off step (scripts/load_heroes.py), not run on app startup. Until
+    it succeeds, matches recorded before the table existed have no
+    participant rows, so get_counter_effectiveness and get_synergy_analysis
+    leave them out. It is safe to re-run: it takes a transaction-level
+    advisory lock first, so concurrent runs wait for each other instead of
+    both seeing a match as missing and writing its rows twice. The lock is
+    held until the caller commits.
+
+    Does not commit.
+
+    Returns:
+        Number of participant rows written
+    """
+    db.execute(select(func.pg_advisory_xact_lock(PARTICIPANT_BACKFILL_LOCK_ID)))
+
+    missing = ~select(MatchParticipant.id).where(
+        MatchParticipant.match_id == MatchHistory.id
+    ).exists()
+
+    def side_rows(side: str, composition):
+        hero = func.json_array_elements_text(composition).table_valued("value")
+        return (
+            select(
+                MatchHistory.id,
+                MatchHistory.hero_id,
+                hero.c.value,
+                literal(side),
+                MatchHistory.performance_score,
+                MatchHistory.created_at,
+            )
+            .select_from(MatchHistory)
+            .join(hero, true())
+            .where(missing)
+        )
+
+    stmt = insert(MatchParticipant).from_select(
+        [
+            MatchParticipant.match_id,
+            MatchParticipant.hero_id,
+            MatchParticipant.hero_name,
+            MatchParticipant.side,
+            MatchParticipant.performance_score,
+            MatchParticipant.created_at,
+        ],
+        union_all(
+            side_rows("ally", MatchHistory.team_composition),
+            side_rows("enemy", MatchHistory.enemy_composition),
+        ),
+    )
+    return db.execute(stmt).rowcount
@@ -8,6 +8,8 @@ from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import NullPool
 import logging
 
+from . import json_codec
+
 logger = logging.getLogger(__name__)
 
 # Database URL from environment
@@ -21,6 +23,9 @@ if not DATABASE_URL:
 engine = create_engine(
     DATABASE_URL,
     poolclass=NullPool,
+    query_cache_size=1200,  # Compiled-statement cache (reused across requests)
+    json_serializer=json_codec.dumps,  # JSON columns (orjson when installed)
+    json_deserializer=json_codec.loads,
     echo=os.getenv("DEBUG", "false").lower() == "true",  # Log SQL in debug mode
     connect_args={
         "connect_timeout": 10,
@@ -70,7 +75,7 @@ def init_db():
     """
     try:
         # Import models to register them with Base
-        from app.db.models import Hero, MatchHistory, PlayerPreference
+        from app.db.models import Hero, MatchHistory, MatchParticipant, PlayerPreference
 
         logger.info("Creating database tables...")
         Base.metadata.create_all(bind=engine)
@@ -87,7 +92,7 @@ def drop_all_tables():
     Drop all tables. USE WITH CAUTION - development only.
     """
     try:
-        from app.db.models import Hero, MatchHistory, PlayerPreference
+        from app.db.models import Hero, MatchHistory, MatchParticipant, PlayerPreference
 
         logger.warning("⚠️  Dropping all database tables...")
         Base.metadata.drop_all(bind=engine)
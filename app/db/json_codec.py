@@ -0,0 +1,77 @@
+"""
+JSON encode/decode used for JSON columns and hero data files.
+
+Uses orjson when it is installed and falls back to the standard library.
+orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+catching the stdlib exception either way. iter_array streams with ijson
+when available.
+"""
+
+import json
+from typing import Any, Iterator
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional speedup
+    ijson = None
+
+
+if orjson is not None:
+
+    def loads(data: Any) -> Any:
+        """Decode JSON from str or bytes"""
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> str:
+        """Encode to a compact JSON string"""
+        return orjson.dumps(obj).decode("utf-8")
+
+    def dumps_pretty(obj: Any) -> bytes:
+        """Encode to UTF-8 JSON indented by two spaces"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+else:
+
+    def loads(data: Any) -> Any:
+        """Decode JSON from str or bytes"""
+        return json.loads(data)
+
+    def dumps(obj: Any) -> str:
+        """Encode to a compact JSON string"""
+        return json.dumps(obj, separators=(",", ":"))
+
+    def dumps_pretty(obj: Any) -> bytes:
+        """Encode to UTF-8 JSON indented by two spaces"""
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def load_file(path: str) -> Any:
+    """Read and decode a UTF-8 JSON file"""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def write_file(path: str, obj: Any):
+    """Write obj to path as indented UTF-8 JSON"""
+    with open(path, "wb") as f:
+        f.write(dumps_pretty(obj))
+
+
+def iter_array(path: str, key: str) -> Iterator[Any]:
+    """
+    Yield the items of the top-level array at data[key] in a JSON file.
+
+    With ijson the file is parsed incrementally, so only one item is held
+    in memory at a time; otherwise the whole file is decoded first.
+    """
+    if ijson is None:
+        yield from load_file(path).get(key, [])
+        return
+
+    with open(path, "rb") as f:
+        yield from ijson.items(f, f"{key}.item", use_float=True)
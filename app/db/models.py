@@ -1,12 +1,28 @@
 """
 Database models for DraftSensei
-Hero, MatchHistory, and PlayerPreference tables
+Hero, MatchHistory, MatchParticipant, and PlayerPreference tables
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    bindparam,
+    delete,
+    event,
+    insert,
+    inspect,
+    select,
+    Column,
+    Integer,
+    String,
+    Float,
+    DateTime,
+    JSON,
+    ForeignKey,
+    Text,
+    Index,
+)
+from sqlalchemy.orm import Session, relationship
 from datetime import datetime
-import json
+from typing import Optional
 import logging
 
 from .database import Base
@@ -58,23 +74,48 @@ class Hero(Base):
         """Set hero meta attributes"""
         self.meta_json = meta
 
-    def get_primary_role(self) -> str:
-        """Get hero's primary role from meta"""
-        meta = self.get_meta()
+    def get_roles(self) -> Optional[dict]:
+        """
+        Get meta["attributes"]["roles"], or None if meta has no roles.
+        Memoized until meta_json is replaced (set_meta or assignment).
+        """
+        meta = self.meta_json
+        cached = self.__dict__.get("_roles_cache")
+        if cached is not None and cached[0] is meta:
+            return cached[1]
+
+        roles = None
         if meta and isinstance(meta, dict):
             if "attributes" in meta and "roles" in meta["attributes"]:
-                return meta["attributes"]["roles"].get("primary_role", "Unknown")
+                roles = meta["attributes"]["roles"]
+        self._roles_cache = (meta, roles)
+        return roles
+
+    def get_primary_role(self) -> str:
+        """Get hero's primary role from meta"""
+        roles = self.get_roles()
+        if roles is not None:
+            return roles.get("primary_role", "Unknown")
         return "Unknown"
 
     def get_lane_priority(self) -> list:
         """Get hero's lane priority list from meta"""
-        meta = self.get_meta()
-        if meta and isinstance(meta, dict):
-            if "attributes" in meta and "roles" in meta["attributes"]:
-                return meta["attributes"]["roles"].get("lane_priority", [])
+        roles = self.get_roles()
+        if roles is not None:
+            return roles.get("lane_priority", [])
         return []
 
 
+# Hero lookup by name, built once and executed with a bound name so every
+# lookup reuses the compiled statement (names are unique: one index seek)
+HERO_BY_NAME = select(Hero).where(Hero.name == bindparam("name"))
+
+
+def hero_by_name(db: Session, name: str) -> Optional[Hero]:
+    """Get a hero by exact name, or None"""
+    return db.scalar(HERO_BY_NAME, {"name": name})
+
+
 class MatchHistory(Base):
     """Match history tracking hero performance"""
 
@@ -88,7 +129,8 @@ class MatchHistory(Base):
     performance_score = Column(Float, default=0.0)  # Custom performance metric (0-100)
     kda_score = Column(Float, nullable=True)  # K/D/A metric
 
-    # Match details
+    # Match details (analytics query the fanned-out MatchParticipant rows,
+    # not these columns)
     lane = Column(String(50), nullable=True)  # Lane played
     team_composition = Column(JSON, nullable=True)  # Other heroes picked
     enemy_composition = Column(JSON, nullable=True)  # Enemy heroes
@@ -98,11 +140,111 @@ class MatchHistory(Base):
 
     # Relationship
     hero = relationship("Hero", back_populates="match_histories")
+    participants = relationship(
+        "MatchParticipant",
+        back_populates="match",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     def __repr__(self):
         return f"<MatchHistory(hero_id={self.hero_id}, win={self.win}, score={self.performance_score})>"
 
 
+class MatchParticipant(Base):
+    """
+    One row per hero in a match's team or enemy composition.
+
+    Denormalized from MatchHistory when a match is written, and rewritten
+    when its copied fields change (see _fan_out_participants and
+    _refresh_participants), so analytics group over this narrow, indexed
+    table instead of unnesting the JSON compositions on every query.
+    """
+
+    __tablename__ = "match_participants"
+
+    id = Column(Integer, primary_key=True)
+    match_id = Column(
+        Integer,
+        ForeignKey("match_histories.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    hero_id = Column(Integer, ForeignKey("heroes.id"), nullable=False)  # Match's hero
+    hero_name = Column(String(100), nullable=False)  # Participating hero
+    side = Column(String(10), nullable=False)  # "ally" or "enemy"
+
+    # Copied from the match
+    performance_score = Column(Float, default=0.0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationship
+    match = relationship("MatchHistory", back_populates="participants")
+
+    __table_args__ = (
+        # "Is this hero on that side of the match" is an index-only probe;
+        # also serves plain match_id lookups
+        Index("ix_match_participants_match_side_hero", "match_id", "side", "hero_name"),
+        Index("ix_match_participants_hero_name_created_at", "hero_name", "created_at"),
+        Index("ix_match_participants_hero_id_created_at", "hero_id", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<MatchParticipant(match_id={self.match_id}, hero='{self.hero_name}', side='{self.side}')>"
+
+
+def _participant_rows(match: MatchHistory) -> list:
+    """MatchParticipant rows for a match's team and enemy compositions"""
+    return [
+        {
+            "match_id": match.id,
+            "hero_id": match.hero_id,
+            "hero_name": hero_name,
+            "side": side,
+            "performance_score": match.performance_score,
+            "created_at": match.created_at,
+        }
+        for side, composition in (
+            ("ally", match.team_composition),
+            ("enemy", match.enemy_composition),
+        )
+        for hero_name in composition or []
+    ]
+
+
+# MatchHistory attributes copied into its participant rows
+_PARTICIPANT_SOURCE_ATTRS = (
+    "hero_id",
+    "team_composition",
+    "enemy_composition",
+    "performance_score",
+    "created_at",
+)
+
+
+@event.listens_for(MatchHistory, "after_insert")
+def _fan_out_participants(mapper, connection, match):
+    """Write the participant rows in the same flush as the match"""
+    rows = _participant_rows(match)
+    if rows:
+        connection.execute(insert(MatchParticipant), rows)
+
+
+@event.listens_for(MatchHistory, "after_update")
+def _refresh_participants(mapper, connection, match):
+    """Rewrite the participant rows when the fields they copy change"""
+    state = inspect(match)
+    if not any(
+        state.attrs[attr].history.has_changes() for attr in _PARTICIPANT_SOURCE_ATTRS
+    ):
+        return
+    connection.execute(
+        delete(MatchParticipant).where(MatchParticipant.match_id == match.id)
+    )
+    rows = _participant_rows(match)
+    if rows:
+        connection.execute(insert(MatchParticipant), rows)
+
+
 class PlayerPreference(Base):
     """Player preference weights for hero recommendations"""
 
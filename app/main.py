@@ -5,7 +5,7 @@ Main FastAPI application setup and configuration
 
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
 import os
 import logging
@@ -13,6 +13,7 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+from app.db import json_codec
 from app.db.database import init_db, test_connection
 from app.routers import draft_router, heroes_router
 
@@ -94,6 +95,10 @@ app = FastAPI(
     version="1.0.0",
     contact={"name": "DraftSensei Team", "email": "support@draftsensei.com"},
     lifespan=lifespan,
+    # Serialize responses with orjson when it is installed
+    default_response_class=(
+        ORJSONResponse if json_codec.orjson is not None else JSONResponse
+    ),
 )
 
 # Configure CORS
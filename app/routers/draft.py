@@ -5,7 +5,6 @@ Uses refactored modular services
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
 
 from app.db.database import get_db
 from app.schemas.intelligent_draft_schema import (
@@ -23,7 +22,9 @@ router = APIRouter(prefix="/draft", tags=["draft"])
     response_model=IntelligentDraftResponse,
     summary="Get intelligent draft suggestions with adaptive weighting",
 )
-async def intelligent_suggest_picks(
+# Plain def: the DB session and scoring are blocking, so FastAPI runs this in
+# its worker threadpool and concurrent drafts don't stall the event loop
+def intelligent_suggest_picks(
     request: IntelligentDraftRequest, db: Session = Depends(get_db)
 ) -> IntelligentDraftResponse:
     """
@@ -2,19 +2,20 @@
 Heroes API Router - Endpoints for hero management and data
 """
 
+from collections import Counter
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
-from typing import List, Optional
+from typing import Optional
 
 from ..db.database import get_db
-from ..db.models import Hero
+from ..db.models import Hero, hero_by_name
+from ..services.draft.analyzer import DraftAnalyzer
 from ..schemas.hero_schema import (
     Hero as HeroSchema,
     HeroCreate,
     HeroUpdate,
     HeroList,
-    HeroSearchRequest,
     BulkHeroUpdate,
 )
 
@@ -52,15 +53,12 @@ async def get_heroes_list(
         # Filter by role if specified (role is in meta JSON)
         if role:
             filtered_heroes = []
+            role = role.lower()
             for hero in all_heroes:
-                meta = hero.get_meta()
-                if meta and isinstance(meta, dict):
-                    if "attributes" in meta and "roles" in meta["attributes"]:
-                        primary_role = meta["attributes"]["roles"].get(
-                            "primary_role", ""
-                        )
-                        if primary_role.lower() == role.lower():
-                            filtered_heroes.append(hero)
+                roles = hero.get_roles()
+                if roles is not None:
+                    if roles.get("primary_role", "").lower() == role:
+                        filtered_heroes.append(hero)
             all_heroes = filtered_heroes
 
         # Get total count after filtering
@@ -73,13 +71,6 @@ async def get_heroes_list(
         hero_list = []
         for hero in heroes:
             metadata = hero.get_meta()
-            # Extract primary role from nested meta structure
-            primary_role = "Unknown"
-            if metadata and isinstance(metadata, dict):
-                if "attributes" in metadata and "roles" in metadata["attributes"]:
-                    primary_role = metadata["attributes"]["roles"].get(
-                        "primary_role", "Unknown"
-                    )
 
             hero_data = HeroSchema(
                 id=hero.id,
@@ -111,7 +102,7 @@ async def get_hero_by_id(hero_id: int, db: Session = Depends(get_db)) -> HeroSch
     Returns complete hero information including stats, counters, and synergies.
     """
     try:
-        hero = db.query(Hero).filter(Hero.id == hero_id).first()
+        hero = db.get(Hero, hero_id)  # Primary key lookup (identity map first)
 
         if not hero:
             raise HTTPException(
@@ -148,7 +139,7 @@ async def get_hero_by_name(hero_name: str, db: Session = Depends(get_db)) -> Her
     Returns complete hero information including stats and metadata.
     """
     try:
-        hero = db.query(Hero).filter(Hero.name == hero_name).first()
+        hero = hero_by_name(db, hero_name)
 
         if not hero:
             raise HTTPException(
@@ -191,7 +182,7 @@ async def create_hero(
     """
     try:
         # Check if hero already exists
-        existing_hero = db.query(Hero).filter(Hero.name == hero_data.name).first()
+        existing_hero = hero_by_name(db, hero_data.name)
         if existing_hero:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -209,6 +200,7 @@ async def create_hero(
 
         db.add(new_hero)
         db.commit()
+        DraftAnalyzer.invalidate_hero_cache()
         db.refresh(new_hero)
 
         return HeroSchema(
@@ -244,7 +236,7 @@ async def update_hero(
     Returns the updated hero information.
     """
     try:
-        hero = db.query(Hero).filter(Hero.name == hero_name).first()
+        hero = hero_by_name(db, hero_name)
 
         if not hero:
             raise HTTPException(
@@ -256,7 +248,7 @@ async def update_hero(
         if hero_update.name is not None:
             # Check if new name conflicts
             if hero_update.name != hero.name:
-                existing = db.query(Hero).filter(Hero.name == hero_update.name).first()
+                existing = hero_by_name(db, hero_update.name)
                 if existing:
                     raise HTTPException(
                         status_code=status.HTTP_409_CONFLICT,
@@ -274,6 +266,7 @@ async def update_hero(
             hero.set_meta(hero_update.meta)
 
         db.commit()
+        DraftAnalyzer.invalidate_hero_cache()
         db.refresh(hero)
 
         return HeroSchema(
@@ -314,12 +307,17 @@ async def bulk_update_heroes(
         created_count = 0
         errors = []
 
+        # Existing heroes for the whole batch in one query
+        names = [hero_data.name for hero_data in bulk_update.heroes]
+        heroes_by_name = {
+            hero.name: hero
+            for hero in db.execute(select(Hero).where(Hero.name.in_(names))).scalars()
+        }
+
         for hero_data in bulk_update.heroes:
             try:
-                # Check if hero exists
-                existing_hero = (
-                    db.query(Hero).filter(Hero.name == hero_data.name).first()
-                )
+                # Check if hero exists (or was created earlier in this batch)
+                existing_hero = heroes_by_name.get(hero_data.name)
 
                 if existing_hero:
                     # Update existing hero
@@ -345,6 +343,7 @@ async def bulk_update_heroes(
                         new_hero.set_meta(hero_data.meta)
 
                     db.add(new_hero)
+                    heroes_by_name[hero_data.name] = new_hero
                     created_count += 1
 
             except Exception as e:
@@ -353,6 +352,7 @@ async def bulk_update_heroes(
 
         # Commit all changes
         db.commit()
+        DraftAnalyzer.invalidate_hero_cache()
 
         result = {
             "message": "Bulk update completed",
@@ -384,7 +384,7 @@ async def delete_hero(hero_name: str, db: Session = Depends(get_db)):
     Warning: This will also delete all associated match history and preferences.
     """
     try:
-        hero = db.query(Hero).filter(Hero.name == hero_name).first()
+        hero = hero_by_name(db, hero_name)
 
         if not hero:
             raise HTTPException(
@@ -394,6 +394,7 @@ async def delete_hero(hero_name: str, db: Session = Depends(get_db)):
 
         db.delete(hero)
         db.commit()
+        DraftAnalyzer.invalidate_hero_cache()
 
         return {"message": f"Hero '{hero_name}' deleted successfully"}
 
@@ -415,20 +416,17 @@ async def get_role_distribution(db: Session = Depends(get_db)):
     Returns count of heroes per role and percentage distribution.
     """
     try:
-        # Get all heroes and extract roles from meta
-        heroes = db.query(Hero).all()
-        role_counts = {}
-
-        for hero in heroes:
-            meta = hero.get_meta()
-            if meta and isinstance(meta, dict):
-                if "attributes" in meta and "roles" in meta["attributes"]:
-                    primary_role = meta["attributes"]["roles"].get(
-                        "primary_role", "Unknown"
-                    )
-                    role_counts[primary_role] = role_counts.get(primary_role, 0) + 1
+        # Only the meta column is needed - read plain rows, not Hero entities
+        metas = db.execute(select(Hero.meta_json)).scalars().all()
+        role_counts = Counter(
+            meta["attributes"]["roles"].get("primary_role", "Unknown")
+            for meta in metas
+            if isinstance(meta, dict)
+            and "attributes" in meta
+            and "roles" in meta["attributes"]
+        )
 
-        total_heroes = len(heroes)
+        total_heroes = len(metas)
 
         distribution = {}
         for role, count in role_counts.items():
@@ -22,6 +22,20 @@ class DraftConfig:
 
     ALL_LANES: List[str] = ["exp", "jungle", "mid", "gold", "roam"]
 
+    # One bit per lane; a hero's lane_mask ORs the bits of every lane they play
+    LANE_BITS: Dict[str, int] = {lane: 1 << i for i, lane in enumerate(ALL_LANES)}
+
+    # ===== HERO ATTRIBUTE CATEGORIES =====
+    # Numeric stat groups in meta["attributes"]; flattened into one
+    # {stat: value} dict per hero at load (field names are unique across groups)
+    STAT_CATEGORIES: List[str] = [
+        "combat",
+        "survivability",
+        "utility",
+        "range_playstyle",
+        "power_curve",
+    ]
+
     # ===== LANE PRIORITY & IMPORTANCE =====
     # Determines which empty lane to fill first
     LANE_IMPORTANCE: Dict[str, int] = {
@@ -108,7 +122,11 @@ class DraftConfig:
         "role_fit": 0.10,
     }
 
-    HIGH_STAT_THRESHOLD = 4
+    # ===== STAT THRESHOLDS (attributes are rated 0-5) =====
+    HIGH_STAT_THRESHOLD = 4  # Strong stat - full rule bonus
+    MID_STAT_THRESHOLD = 3  # Decent stat - reduced bonus / support rules
+    LOW_STAT_THRESHOLD = 2  # Weak stat (squishy, short range, immobile)
+    LOW_DEFENSE_THRESHOLD = 3  # shields + regen at or below = low defense
 
     # ===== DRAFT PHASE DEFINITIONS =====
     EARLY_DRAFT_THRESHOLD = 4  # Total picks <= 4 = early draft
@@ -197,6 +215,15 @@ class DraftConfig:
     TOP_SUGGESTIONS_COUNT = 5  # Return top 5 heroes
     REASONS_PER_HERO = 5  # Max reasons shown per hero
 
+    # ===== HERO CACHE =====
+    # Seconds loaded heroes are reused without re-checking the heroes table
+    # (hero writes through the API invalidate immediately)
+    HERO_CACHE_RECHECK_SECONDS = 5
+    # Draft results remembered per loaded hero set (LRU)
+    RESULT_CACHE_SIZE = 1024
+    # Rows fetched per round trip when loading the heroes table
+    HERO_SCAN_BATCH_SIZE = 500
+
     # ===== LOGGING =====
     LOG_SCORING_DETAILS = False
     LOG_WEIGHT_CALCULATIONS = False
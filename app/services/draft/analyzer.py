@@ -3,8 +3,19 @@ Draft Analyzer
 Main orchestrator - coordinates lane selection and hero evaluation.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+import copy
+import heapq
 import logging
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from itertools import chain
+from operator import itemgetter
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.db.models import Hero
@@ -14,6 +25,12 @@ from .hero_evaluator import HeroEvaluator
 
 logger = logging.getLogger(__name__)
 
+# Optional file the loaded heroes are persisted to, so a new process (CLI
+# scripts, worker restarts) skips the full read while the table is unchanged
+HERO_CACHE_FILE = os.getenv("DRAFT_HERO_CACHE_FILE")
+# Bumped whenever the per-hero fields change, so older cache files are ignored
+HERO_CACHE_FORMAT = 2
+
 
 class DraftAnalyzer:
     """
@@ -25,6 +42,24 @@ class DraftAnalyzer:
       4. Return top 5 suggestions with reasons
     """
 
+    # Loaded heroes shared across instances (one analyzer is built per
+    # request), keyed on a cheap fingerprint of the heroes table
+    _hero_cache: Optional[Tuple[Tuple[Any, ...], Dict[str, Dict[str, Any]]]] = None
+    _hero_cache_lock = threading.Lock()
+    # time.monotonic() when _hero_cache was last confirmed current
+    _hero_cache_checked_at = 0.0
+    # (heroes_data, hero_ids) for the most recently loaded heroes_data
+    _hero_ids_cache: Optional[Tuple[Dict[str, Dict[str, Any]], Dict[str, int]]] = None
+    # (banned, enemy, ally) -> result of a fresh analyzer, for the heroes_data
+    # in _result_cache_heroes (replaced heroes clear it)
+    _result_cache: "OrderedDict[Tuple[Tuple[str, ...], ...], Dict[str, Any]]" = OrderedDict()
+    _result_cache_heroes: Optional[Dict[str, Dict[str, Any]]] = None
+    _result_cache_lock = threading.Lock()
+    # (heroes_data, lane rosters) for the most recently loaded heroes_data
+    _lane_rosters_cache: Optional[
+        Tuple[Dict[str, Dict[str, Any]], Dict[str, Tuple[Tuple[str, int], ...]]]
+    ] = None
+
     def __init__(self, db_session: Session):
         self.db = db_session
         self.config = DraftConfig()
@@ -33,9 +68,26 @@ class DraftAnalyzer:
 
         # Load heroes once on init
         self.heroes_data = self._load_heroes_from_db()
+        self.hero_evaluator.clear_caches()
+
+        # Case-insensitive name -> hero id, for resolving request hero names,
+        # and the heroes able to play each lane (both built once per
+        # heroes_data, like the heroes themselves)
+        self.hero_ids = self._get_hero_ids(self.heroes_data)
+        self.lane_rosters = self._get_lane_rosters(self.heroes_data)
 
         # Diversity tracking (prevents same hero being suggested repeatedly)
-        self.suggestion_count: Dict[str, int] = {}
+        self.suggestion_count: Counter = Counter()
+
+        # Diversity penalty by times suggested (index capped at 5)
+        self._diversity_penalties = (
+            0.0,
+            self.config.DIVERSITY_PENALTY_LOW,
+            self.config.DIVERSITY_PENALTY_LOW,
+            self.config.DIVERSITY_PENALTY_MID,
+            self.config.DIVERSITY_PENALTY_MID,
+            self.config.DIVERSITY_PENALTY_HIGH,
+        )
 
     def suggest_best_lane_and_heroes(
         self,
@@ -72,6 +124,21 @@ class DraftAnalyzer:
             f"Draft request: {len(ally_picks)} ally picks, {len(enemy_picks)} enemy picks, {len(banned_heroes)} bans"
         )
 
+        # Before any suggestion is tracked, the result depends only on the
+        # picks and the loaded heroes, so repeated drafts reuse it
+        cache_key = None
+        if not self.suggestion_count:
+            cache_key = (tuple(banned_heroes), tuple(enemy_picks), tuple(ally_picks))
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                self.suggestion_count.update(s["hero"] for s in cached["suggestions"])
+                return cached
+
+        # Picks are looked up in heroes_data many times per request; interned
+        # they match its (interned) keys by identity
+        enemy_picks = [sys.intern(name) for name in enemy_picks]
+        ally_picks = [sys.intern(name) for name in ally_picks]
+
         # Step 1: Pick the best lane to fill
         lane_code, lane_name, lane_reasoning = self.lane_selector.select_best_lane(
             banned_heroes, enemy_picks, ally_picks, self.heroes_data
@@ -84,12 +151,39 @@ class DraftAnalyzer:
             banned_heroes, enemy_picks, ally_picks, lane_code
         )
 
-        return {
+        result = {
             "recommended_lane": lane_name,
             "lane_code": lane_code,
             "reasoning": lane_reasoning,
             "suggestions": suggestions,
         }
+        if cache_key is not None:
+            self._store_result(cache_key, result)
+        return result
+
+    def _get_cached_result(self, key: Tuple[Tuple[str, ...], ...]) -> Optional[Dict[str, Any]]:
+        """A copy of the cached result for these picks, or None"""
+        with DraftAnalyzer._result_cache_lock:
+            if DraftAnalyzer._result_cache_heroes is not self.heroes_data:
+                return None
+            result = DraftAnalyzer._result_cache.get(key)
+            if result is None:
+                return None
+            DraftAnalyzer._result_cache.move_to_end(key)
+        return copy.deepcopy(result)
+
+    def _store_result(self, key: Tuple[Tuple[str, ...], ...], result: Dict[str, Any]):
+        """Cache a copy of a fresh analyzer's result, evicting the oldest"""
+        result = copy.deepcopy(result)
+        with DraftAnalyzer._result_cache_lock:
+            cache = DraftAnalyzer._result_cache
+            if DraftAnalyzer._result_cache_heroes is not self.heroes_data:
+                cache.clear()
+                DraftAnalyzer._result_cache_heroes = self.heroes_data
+            cache[key] = result
+            cache.move_to_end(key)
+            while len(cache) > self.config.RESULT_CACHE_SIZE:
+                cache.popitem(last=False)
 
     def _get_suggestions(
         self,
@@ -101,107 +195,279 @@ class DraftAnalyzer:
         """
         Score all available heroes for the target lane and return top 5.
 
-        Heroes who cannot play the lane are filtered out automatically
-        by the HeroEvaluator (score = 0).
+        Heroes who cannot play the lane are pruned before scoring, using
+        the same lane-fit check the HeroEvaluator applies (score = 0).
         """
-        # Build set of unavailable heroes
-        unavailable = set(h.lower() for h in banned_heroes + enemy_picks + ally_picks)
+        # Build set of unavailable hero ids (names are matched case-insensitively)
+        hero_ids = self.hero_ids
+        unavailable = frozenset(
+            hero_ids[key]
+            for key in map(str.lower, chain(banned_heroes, enemy_picks, ally_picks))
+            if key in hero_ids
+        )
 
-        # Get candidates (available heroes only)
+        # Get candidates (available heroes that can play the lane). The lane
+        # roster is the evaluator's hard lane-fit filter, precomputed, so
+        # heroes that would score 0 never go through the scoring pipeline.
         candidates = [
-            name for name in self.heroes_data if name.lower() not in unavailable
+            name
+            for name, hero_id in self.lane_rosters.get(lane_code, ())
+            if hero_id not in unavailable
         ]
 
         logger.info(f"Evaluating {len(candidates)} candidates for {lane_code}")
 
-        # Score each candidate
-        scored = []
-        for hero_name in candidates:
-            try:
-                hero = self.heroes_data[hero_name]
-                score, reasons = self.hero_evaluator.evaluate_hero(
-                    hero_name,
-                    hero,
-                    banned_heroes,
-                    enemy_picks,
-                    ally_picks,
-                    lane_code,
-                    self.heroes_data,
-                )
-
-                # Skip heroes who can't play the lane (score = 0)
-                if score <= 0:
-                    continue
-
-                # Apply diversity penalty
-                penalty = self._get_diversity_penalty(hero_name)
-                final_score = score * (1 - penalty)
-
-                # Get hero role
-                role = (
-                    hero.get("meta", {})
-                    .get("attributes", {})
-                    .get("roles", {})
-                    .get("primary_role", "Unknown")
-                )
-
-                scored.append(
-                    {
-                        "hero": hero_name,
-                        "score": round(final_score, 2),
-                        "reasons": reasons,
-                        "role": role,
-                    }
-                )
+        # Score all candidates in one batch
+        evaluated = self.hero_evaluator.evaluate_candidates(
+            candidates,
+            banned_heroes,
+            enemy_picks,
+            ally_picks,
+            lane_code,
+            self.heroes_data,
+        )
 
-            except Exception as e:
-                logger.error(f"Error evaluating {hero_name}: {e}")
+        scored = []
+        for hero_name, score, breakdown in evaluated:
+            # Skip heroes who can't play the lane (score = 0)
+            if score <= 0:
                 continue
 
-        # Sort by score descending
-        scored.sort(key=lambda x: x["score"], reverse=True)
-        top = scored[: self.config.TOP_SUGGESTIONS_COUNT]
+            # Apply diversity penalty
+            penalty = self._get_diversity_penalty(hero_name)
+            final_score = score * (1 - penalty)
+
+            scored.append((round(final_score, 2), hero_name, score, breakdown))
+
+        # Keep the top N by score (ties keep candidate order, like a stable sort);
+        # reasons and result dicts are only built for the picks actually returned
+        top = []
+        for final_score, hero_name, score, breakdown in heapq.nlargest(
+            self.config.TOP_SUGGESTIONS_COUNT, scored, key=itemgetter(0)
+        ):
+            hero = self.heroes_data[hero_name]
+            top.append(
+                {
+                    "hero": hero_name,
+                    "score": final_score,
+                    "reasons": self.hero_evaluator.explain(
+                        hero_name, hero, lane_code, score, breakdown
+                    ),
+                    "role": hero["primary_role"] or "Unknown",
+                }
+            )
 
         logger.info(f"Top {len(top)} suggestions for {lane_code}:")
         for s in top:
             logger.info(f"  {s['hero']}: {s['score']:.2f}")
 
         # Track suggestions for diversity
-        for s in top:
-            hero = s["hero"]
-            self.suggestion_count[hero] = self.suggestion_count.get(hero, 0) + 1
+        self.suggestion_count.update(s["hero"] for s in top)
 
         return top
 
     def _get_diversity_penalty(self, hero_name: str) -> float:
         """Penalty for frequently suggested heroes to ensure variety"""
-        count = self.suggestion_count.get(hero_name, 0)
-        if count == 0:
-            return 0.0
-        elif count <= 2:
-            return self.config.DIVERSITY_PENALTY_LOW
-        elif count <= 4:
-            return self.config.DIVERSITY_PENALTY_MID
-        else:
-            return self.config.DIVERSITY_PENALTY_HIGH
+        count = self.suggestion_count[hero_name]
+        return self._diversity_penalties[min(count, 5)]
+
+    @classmethod
+    def _get_hero_ids(cls, heroes_data: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        """Lowercase name -> hero id, shared while heroes_data is reused"""
+        cached = cls._hero_ids_cache
+        if cached is not None and cached[0] is heroes_data:
+            return cached[1]
+
+        hero_ids = {name.lower(): hero["id"] for name, hero in heroes_data.items()}
+        cls._hero_ids_cache = (heroes_data, hero_ids)
+        return hero_ids
+
+    @classmethod
+    def _get_lane_rosters(
+        cls, heroes_data: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Tuple[Tuple[str, int], ...]]:
+        """
+        Lane code -> (name, id) of every hero who can play it, in
+        heroes_data order; shared while heroes_data is reused. A hero can
+        play a lane if it is in their lane_rank (lane fit score above 0).
+        """
+        cached = cls._lane_rosters_cache
+        if cached is not None and cached[0] is heroes_data:
+            return cached[1]
+
+        rosters: Dict[str, List[Tuple[str, int]]] = {}
+        for name, hero in heroes_data.items():
+            for code in hero["lane_rank"]:
+                rosters.setdefault(code, []).append((name, hero["id"]))
+        lane_rosters = {code: tuple(heroes) for code, heroes in rosters.items()}
+        cls._lane_rosters_cache = (heroes_data, lane_rosters)
+        return lane_rosters
+
+    @classmethod
+    def invalidate_hero_cache(cls):
+        """Re-check the heroes table on the next load (call after hero writes)"""
+        cls._hero_cache_checked_at = 0.0
 
     def _load_heroes_from_db(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return all heroes, reusing the class-level cache while the heroes
+        table is unchanged (same row count and latest updated_at).
+
+        The table is re-checked at most every HERO_CACHE_RECHECK_SECONDS,
+        so back-to-back requests are served with no query at all.
+
+        The returned dict is shared between analyzers and must be treated
+        as read-only.
+        """
+        cached = DraftAnalyzer._hero_cache
+        now = time.monotonic()
+        if (
+            cached is not None
+            and now - DraftAnalyzer._hero_cache_checked_at
+            < self.config.HERO_CACHE_RECHECK_SECONDS
+        ):
+            return cached[1]
+
+        try:
+            fingerprint = tuple(
+                self.db.query(func.count(Hero.id), func.max(Hero.updated_at)).one()
+            )
+        except Exception as e:
+            logger.error(f"Failed to fingerprint heroes table: {e}")
+            return self._read_heroes()
+
+        cached = DraftAnalyzer._hero_cache
+        if cached is not None and cached[0] == fingerprint:
+            DraftAnalyzer._hero_cache_checked_at = now
+            return cached[1]
+
+        with DraftAnalyzer._hero_cache_lock:
+            cached = DraftAnalyzer._hero_cache
+            if cached is not None and cached[0] == fingerprint:
+                DraftAnalyzer._hero_cache_checked_at = now
+                return cached[1]
+
+            heroes_data = self._read_hero_cache_file(fingerprint)
+            if heroes_data is None:
+                heroes_data = self._read_heroes()
+                if heroes_data:
+                    self._write_hero_cache_file(fingerprint, heroes_data)
+            if heroes_data:
+                DraftAnalyzer._hero_cache = (fingerprint, heroes_data)
+                DraftAnalyzer._hero_cache_checked_at = now
+            return heroes_data
+
+    def _read_hero_cache_file(
+        self, fingerprint: Tuple[Any, ...]
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Heroes from HERO_CACHE_FILE if it was written for this fingerprint,
+        else None. Names and roles are re-interned as in _read_heroes.
+        """
+        if not HERO_CACHE_FILE:
+            return None
+        try:
+            with open(HERO_CACHE_FILE, "rb") as f:
+                saved_fingerprint, saved_heroes = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable hero cache file: {e}")
+            return None
+        if saved_fingerprint != (HERO_CACHE_FORMAT, fingerprint):
+            return None
+
+        heroes_data = {}
+        for name, hero in saved_heroes.items():
+            name = sys.intern(name)
+            hero["name"] = name
+            hero["primary_role"] = sys.intern(hero["primary_role"])
+            heroes_data[name] = hero
+        logger.info(f"Loaded {len(heroes_data)} heroes from {HERO_CACHE_FILE}")
+        return heroes_data
+
+    def _write_hero_cache_file(
+        self, fingerprint: Tuple[Any, ...], heroes_data: Dict[str, Dict[str, Any]]
+    ):
+        """Persist loaded heroes to HERO_CACHE_FILE (atomically), if set"""
+        if not HERO_CACHE_FILE:
+            return
+        tmp_path = f"{HERO_CACHE_FILE}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(
+                    ((HERO_CACHE_FORMAT, fingerprint), heroes_data),
+                    f,
+                    pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, HERO_CACHE_FILE)
+        except Exception as e:
+            logger.warning(f"Could not write hero cache file: {e}")
+
+    def _read_heroes(self) -> Dict[str, Dict[str, Any]]:
         """
         Load all heroes from database into memory.
 
-        Only loads heroes that have valid meta attributes.
+        Only loads heroes that have valid meta attributes. The nested
+        meta is flattened once here so the scorers read plain keys:
+          id             - integer id, stable for this load
+          attrs          - {stat: value} across all STAT_CATEGORIES
+          primary_role   - e.g. "Mage"
+          lane_priority  - lane names in order of preference
+          lane_codes     - the same lanes as codes (exp, jungle, ...)
+          lane_rank      - {lane code: index in lane_codes}, for O(1) checks
+          lane_mask      - LANE_BITS of the lanes played, for "can play" checks
+          primary_lane   - first lane code (or None)
+
+        Lanes are handled as codes internally; names are only used in
+        user-facing text.
+
+        Only the name and meta columns are selected - no ORM entities are
+        built, since nothing here needs them. Rows are streamed in batches
+        of HERO_SCAN_BATCH_SIZE rather than fetched as one list, so only the
+        flattened heroes stay in memory. Names and roles are interned, as
+        they are hashed and compared on every scoring path.
         """
         try:
             heroes_data = {}
-            heroes = self.db.query(Hero).all()
+            rows = self.db.execute(
+                select(Hero.name, Hero.meta_json).execution_options(
+                    yield_per=self.config.HERO_SCAN_BATCH_SIZE
+                )
+            )
 
+            reverse_role_map = self.config.REVERSE_ROLE_MAP
+            lane_bits = self.config.LANE_BITS
             skipped = 0
-            for hero in heroes:
-                meta = hero.get_meta()
+            for name, meta in rows:
                 if meta and "attributes" in meta:
-                    heroes_data[hero.name] = {
-                        "name": hero.name,
+                    name = sys.intern(name)
+                    attributes = meta["attributes"]
+                    roles = attributes.get("roles", {})
+                    lanes = tuple(roles.get("lane_priority", []))
+                    lane_codes = tuple(
+                        reverse_role_map.get(lane, lane.lower()) for lane in lanes
+                    )
+                    lane_rank = {}
+                    lane_mask = 0
+                    for rank, code in enumerate(lane_codes):
+                        lane_rank.setdefault(code, rank)
+                        lane_mask |= lane_bits.get(code, 0)
+                    attrs = {}
+                    for category in self.config.STAT_CATEGORIES:
+                        attrs.update(attributes.get(category, {}))
+
+                    heroes_data[name] = {
+                        "id": len(heroes_data),
+                        "name": name,
                         "meta": meta,
+                        "attrs": attrs,
+                        "primary_role": sys.intern(roles.get("primary_role", "")),
+                        "lane_priority": lanes,
+                        "lane_codes": lane_codes,
+                        "lane_rank": lane_rank,
+                        "lane_mask": lane_mask,
+                        "primary_lane": lane_codes[0] if lane_codes else None,
                     }
                 else:
                     skipped += 1
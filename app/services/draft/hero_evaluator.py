@@ -4,8 +4,9 @@ Scores individual heroes using lane-specific weights.
 Heroes that cannot play the target lane are filtered out entirely.
 """
 
-from typing import Dict, Any, List, Tuple
+from typing import Callable, Dict, Any, FrozenSet, List, Optional, Tuple
 import logging
+from functools import lru_cache
 
 from app.services.config.draft_config import DraftConfig
 from app.services.scoring.counter_scorer import CounterScorer
@@ -16,9 +17,55 @@ from .team_analyzer import TeamAnalyzer
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=64)
+def _lane_weights(
+    lane: str, late_draft: bool, enemy_pattern_clear: bool, many_bans: bool
+) -> Dict[str, float]:
+    """
+    Normalized scoring weights for a lane under the given draft-state
+    adjustments. Cached - there are only a handful of combinations, so the
+    returned dict is shared and must not be modified.
+    """
+    weights = DraftConfig.LANE_WEIGHTS.get(lane, DraftConfig.BASE_WEIGHTS).copy()
+
+    # Late draft: team composition becomes more urgent
+    if late_draft:
+        adj = DraftConfig.WEIGHT_ADJUSTMENTS["late_draft"]
+        for key, delta in adj.items():
+            weights[key] = weights.get(key, 0) + delta
+
+    # Enemy pattern clear: boost counter for jungle/mid
+    if enemy_pattern_clear:
+        adj = DraftConfig.WEIGHT_ADJUSTMENTS["enemy_pattern_clear"]
+        for key, delta in adj.items():
+            weights[key] = weights.get(key, 0) + delta
+
+    # Many bans: avoid niche picks
+    if many_bans:
+        adj = DraftConfig.WEIGHT_ADJUSTMENTS["many_bans"]
+        for key, delta in adj.items():
+            weights[key] = weights.get(key, 0) + delta
+
+    # Normalize to sum to 1.0
+    total = sum(weights.values())
+    if total > 0:
+        weights = {k: max(v, 0) / total for k, v in weights.items()}
+
+    return weights
+
+
 class HeroEvaluator:
     """Evaluates and scores individual heroes"""
 
+    # Reason text for the critical gap each lane covers
+    GAP_DESCRIPTIONS = {
+        "jungle": "Provides burst damage & mobility for jungle",
+        "mid": "Provides magic damage and CC from mid",
+        "exp": "Provides frontline tankiness and engage",
+        "gold": "Strong late-game scaling carry",
+        "roam": "Provides CC and team support from roam",
+    }
+
     def __init__(self):
         self.config = DraftConfig()
         self.counter_scorer = CounterScorer()
@@ -26,6 +73,77 @@ class HeroEvaluator:
         self.priority_scorer = PriorityScorer()
         self.team_analyzer = TeamAnalyzer()
 
+        # Lane fit score by position in the hero's lane priority (4th+ = lower)
+        self._lane_fit_by_rank = (
+            self.config.LANE_FIT_PRIMARY,
+            self.config.LANE_FIT_SECONDARY,
+            self.config.LANE_FIT_TERTIARY,
+            self.config.LANE_FIT_LOWER,
+        )
+
+    def clear_caches(self):
+        """Reset per-hero memoization after heroes_data has been (re)loaded"""
+        self.counter_scorer.clear_cache()
+        self.synergy_scorer.clear_cache()
+        self.priority_scorer.clear_cache()
+
+    def evaluate_candidates(
+        self,
+        candidates: List[str],
+        banned_heroes: List[str],
+        enemy_picks: List[str],
+        ally_picks: List[str],
+        current_role: str,
+        heroes_data: Dict[str, Dict[str, Any]],
+    ) -> List[Tuple[str, float, Optional[Tuple]]]:
+        """
+        Score a batch of candidate heroes for the same draft state.
+
+        Draft-level inputs shared by every candidate (weights, ally team
+        stats, enemy/ally profiles) are computed once for the batch instead
+        of once per hero. Heroes that fail to evaluate are logged and left out.
+
+        Only numbers are produced here; call explain() for the heroes that
+        are actually returned.
+
+        Returns:
+            List of (hero_name, score, breakdown) in candidate order
+        """
+        weights = self._get_weights(
+            current_role, banned_heroes, enemy_picks, ally_picks
+        )
+        team_stats = self.team_analyzer._analyze_team_stats(ally_picks, heroes_data)
+        open_gaps = self.team_analyzer.open_gaps(ally_picks, team_stats)
+        stacked_roles = self.team_analyzer.stacked_roles(ally_picks, heroes_data)
+        gap_check = self._critical_gap_check(current_role)
+        enemy_profiles = self.counter_scorer.resolve_enemies(enemy_picks, heroes_data)
+        ally_profiles = self.synergy_scorer.resolve_allies(ally_picks, heroes_data)
+
+        results = []
+        for hero_name in candidates:
+            try:
+                score, breakdown = self.score_hero(
+                    heroes_data[hero_name],
+                    banned_heroes,
+                    enemy_picks,
+                    ally_picks,
+                    current_role,
+                    heroes_data,
+                    weights=weights,
+                    team_stats=team_stats,
+                    open_gaps=open_gaps,
+                    stacked_roles=stacked_roles,
+                    gap_check=gap_check,
+                    enemy_profiles=enemy_profiles,
+                    ally_profiles=ally_profiles,
+                )
+            except Exception as e:
+                logger.error(f"Error evaluating {hero_name}: {e}")
+                continue
+            results.append((hero_name, score, breakdown))
+
+        return results
+
     def evaluate_hero(
         self,
         hero_name: str,
@@ -54,29 +172,69 @@ class HeroEvaluator:
         Returns:
             Tuple of (score 0-100, list of reasons)
         """
-        lane_name = self.config.ROLE_MAP.get(current_role, current_role)
+        score, breakdown = self.score_hero(
+            hero, banned_heroes, enemy_picks, ally_picks, current_role, heroes_data
+        )
+        return score, self.explain(hero_name, hero, current_role, score, breakdown)
+
+    def score_hero(
+        self,
+        hero: Dict[str, Any],
+        banned_heroes: List[str],
+        enemy_picks: List[str],
+        ally_picks: List[str],
+        current_role: str,
+        heroes_data: Dict[str, Dict[str, Any]],
+        weights: Optional[Dict[str, float]] = None,
+        team_stats: Optional[Dict[str, float]] = None,
+        open_gaps: Optional[int] = None,
+        stacked_roles: Optional[FrozenSet[str]] = None,
+        gap_check: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        enemy_profiles: Optional[Tuple[Tuple[int, ...], ...]] = None,
+        ally_profiles: Optional[Tuple[int, ...]] = None,
+    ) -> Tuple[float, Optional[Tuple]]:
+        """
+        Numeric part of evaluate_hero (no reason text).
+
+        Args (beyond evaluate_hero's):
+            weights: Precomputed _get_weights() output (computed if omitted)
+            team_stats: Precomputed ally team stats (computed if omitted)
+            open_gaps: Precomputed TeamAnalyzer.open_gaps() mask
+            stacked_roles: Precomputed TeamAnalyzer.stacked_roles() output
+            gap_check: Precomputed _critical_gap_check() for current_role
+            enemy_profiles: Precomputed CounterScorer.resolve_enemies() output
+            ally_profiles: Precomputed SynergyScorer.resolve_allies() output
 
+        Returns:
+            Tuple of (score 0-100, breakdown). breakdown is
+            (lane, counter, synergy, composition, priority, covers_gap)
+            or None when the hero cannot play the lane (score 0).
+        """
         # ── STEP 1: Hard lane filter ─────────────────────────────────────────
         lane_score = self._calculate_lane_fit_score(hero, current_role)
 
         if lane_score == self.config.LANE_FIT_NO_MATCH:
             # Hero cannot play this lane - completely disqualify
-            return 0.0, [f"Cannot play {lane_name}"]
+            return 0.0, None
 
         # ── STEP 2: Get lane-specific weights with dynamic adjustments ────────
-        weights = self._get_weights(
-            current_role, banned_heroes, enemy_picks, ally_picks
-        )
+        if weights is None:
+            weights = self._get_weights(
+                current_role, banned_heroes, enemy_picks, ally_picks
+            )
 
         # ── STEP 3: Calculate individual component scores ─────────────────────
+        if team_stats is None:
+            team_stats = self.team_analyzer._analyze_team_stats(ally_picks, heroes_data)
+
         counter_score = self.counter_scorer.calculate_counter_score(
-            hero, enemy_picks, heroes_data
+            hero, enemy_picks, heroes_data, enemy_profiles
         )
         synergy_score = self.synergy_scorer.calculate_synergy_score(
-            hero, ally_picks, heroes_data
+            hero, ally_picks, heroes_data, ally_profiles
         )
         comp_score = self.team_analyzer.analyze_composition_gap(
-            hero, ally_picks, heroes_data
+            hero, ally_picks, heroes_data, team_stats, open_gaps, stacked_roles
         )
         priority_score = self.priority_scorer.calculate_pick_priority_score(hero)
 
@@ -90,15 +248,47 @@ class HeroEvaluator:
         )
 
         # ── STEP 5: Critical gap boost ────────────────────────────────────────
-        team_stats = self.team_analyzer._analyze_team_stats(ally_picks, heroes_data)
-        if self._covers_critical_gap(hero, team_stats, current_role):
+        if gap_check is None:
+            gap_check = self._critical_gap_check(current_role)
+        covers_gap = gap_check(hero)
+        if covers_gap:
             final_score *= 1.15
-            gap_reason = self._describe_gap_covered(hero, team_stats, current_role)
-        else:
-            gap_reason = None
 
-        # ── STEP 6: Build reason list ─────────────────────────────────────────
-        reasons = self._build_reasons(
+        return final_score, (
+            lane_score,
+            counter_score,
+            synergy_score,
+            comp_score,
+            priority_score,
+            covers_gap,
+        )
+
+    def explain(
+        self,
+        hero_name: str,
+        hero: Dict[str, Any],
+        current_role: str,
+        final_score: float,
+        breakdown: Optional[Tuple],
+    ) -> List[str]:
+        """Build the reason list for a score_hero() result"""
+        lane_name = self.config.ROLE_MAP.get(current_role, current_role)
+        if breakdown is None:
+            return [f"Cannot play {lane_name}"]
+
+        (
+            lane_score,
+            counter_score,
+            synergy_score,
+            comp_score,
+            priority_score,
+            covers_gap,
+        ) = breakdown
+        gap_reason = (
+            self._describe_gap_covered(hero, current_role) if covers_gap else None
+        )
+
+        return self._build_reasons(
             hero_name,
             hero,
             current_role,
@@ -112,8 +302,6 @@ class HeroEvaluator:
             gap_reason,
         )
 
-        return final_score, reasons
-
     # ─────────────────────────────────────────────────────────────────────────
     # WEIGHTS
     # ─────────────────────────────────────────────────────────────────────────
@@ -129,33 +317,17 @@ class HeroEvaluator:
         Get weights for this lane and adjust for draft state.
 
         Starts from lane-specific base weights from config,
-        then applies dynamic adjustments on top.
+        then applies dynamic adjustments on top. Only which adjustments
+        apply depends on the draft state, so the result is looked up in
+        _lane_weights (read-only).
         """
-        weights = self.config.LANE_WEIGHTS.get(lane, self.config.BASE_WEIGHTS).copy()
         total_picks = len(enemy_picks) + len(ally_picks)
-
-        # Late draft: team composition becomes more urgent
-        if total_picks >= self.config.EARLY_DRAFT_THRESHOLD:
-            adj = self.config.WEIGHT_ADJUSTMENTS["late_draft"]
-            for key, delta in adj.items():
-                weights[key] = weights.get(key, 0) + delta
-
-        # Enemy pattern clear: boost counter for jungle/mid
-        if len(enemy_picks) >= 3 and lane in ["jungle", "mid"]:
-            adj = self.config.WEIGHT_ADJUSTMENTS["enemy_pattern_clear"]
-            for key, delta in adj.items():
-                weights[key] = weights.get(key, 0) + delta
-
-        # Many bans: avoid niche picks
-        if len(banned_heroes) >= 6:
-            adj = self.config.WEIGHT_ADJUSTMENTS["many_bans"]
-            for key, delta in adj.items():
-                weights[key] = weights.get(key, 0) + delta
-
-        # Normalize to sum to 1.0
-        total = sum(weights.values())
-        if total > 0:
-            weights = {k: max(v, 0) / total for k, v in weights.items()}
+        weights = _lane_weights(
+            lane,
+            total_picks >= self.config.EARLY_DRAFT_THRESHOLD,
+            len(enemy_picks) >= 3 and lane in {"jungle", "mid"},
+            len(banned_heroes) >= 6,
+        )
 
         if self.config.LOG_WEIGHT_CALCULATIONS:
             logger.info(f"[{lane}] Final weights: {weights}")
@@ -175,101 +347,84 @@ class HeroEvaluator:
         Returns LANE_FIT_NO_MATCH (0) if hero cannot play the lane at all.
         This is a hard disqualifier.
         """
-        hero_meta = hero.get("meta", {})
-        roles = hero_meta.get("attributes", {}).get("roles", {})
-        lane_priorities = roles.get("lane_priority", [])
-        target_lane = self.config.ROLE_MAP.get(current_role, current_role)
-
-        if target_lane in lane_priorities:
-            idx = lane_priorities.index(target_lane)
-            if idx == 0:
-                return self.config.LANE_FIT_PRIMARY  # 100
-            elif idx == 1:
-                return self.config.LANE_FIT_SECONDARY  # 75
-            elif idx == 2:
-                return self.config.LANE_FIT_TERTIARY  # 50
-            else:
-                return self.config.LANE_FIT_LOWER  # 25
-
-        return self.config.LANE_FIT_NO_MATCH  # 0 - DISQUALIFIED
+        rank = hero["lane_rank"].get(current_role)
+        if rank is None:
+            return self.config.LANE_FIT_NO_MATCH  # 0 - DISQUALIFIED
+
+        # 100 / 75 / 50 / 25 for primary, secondary, tertiary, lower
+        return self._lane_fit_by_rank[min(rank, 3)]
 
     # ─────────────────────────────────────────────────────────────────────────
     # CRITICAL GAP BOOST
     # ─────────────────────────────────────────────────────────────────────────
 
-    def _covers_critical_gap(
-        self,
-        hero: Dict[str, Any],
-        team_stats: Dict[str, float],
-        lane: str,
-    ) -> bool:
+    def _critical_gap_check(self, lane: str) -> Callable[[Dict[str, Any]], bool]:
         """
-        Check if this hero covers a gap the team critically needs.
+        Test for whether a hero covers a gap the team critically needs in
+        this lane, as a hero -> bool function (resolved once per batch rather
+        than once per hero).
 
         Examples:
         - Jungle: Team has no mobility → hero has high mobility → boost
         - EXP: Team has no tankiness → hero is tanky → boost
         - Roam: Team has no CC → hero has CC → boost
         """
-        hero_meta = hero.get("meta", {})
-        attrs = hero_meta.get("attributes", {})
-
-        combat = attrs.get("combat", {})
-        surv = attrs.get("survivability", {})
-        util = attrs.get("utility", {})
-        range_style = attrs.get("range_playstyle", {})
-        power = attrs.get("power_curve", {})
-
         HIGH = self.config.HIGH_STAT_THRESHOLD  # 4
 
         if lane == "jungle":
             # Jungle needs mobility and burst
-            return (
-                surv.get("mobility", 0) >= HIGH or combat.get("burst_damage", 0) >= HIGH
-            )
+            def check(hero: Dict[str, Any]) -> bool:
+                attrs = hero["attrs"]
+                return (
+                    attrs.get("mobility", 0) >= HIGH
+                    or attrs.get("burst_damage", 0) >= HIGH
+                )
 
         elif lane == "mid":
             # Mid needs magic damage and CC
-            role = attrs.get("roles", {}).get("primary_role", "")
-            return role == "Mage" and (
-                combat.get("dps", 0) >= HIGH or util.get("crowd_control", 0) >= HIGH
-            )
+            def check(hero: Dict[str, Any]) -> bool:
+                attrs = hero["attrs"]
+                return hero["primary_role"] == "Mage" and (
+                    attrs.get("dps", 0) >= HIGH
+                    or attrs.get("crowd_control", 0) >= HIGH
+                )
 
         elif lane == "exp":
             # EXP needs tankiness and engage
-            return (
-                surv.get("tankiness", 0) >= HIGH or range_style.get("engage", 0) >= HIGH
-            )
+            def check(hero: Dict[str, Any]) -> bool:
+                attrs = hero["attrs"]
+                return (
+                    attrs.get("tankiness", 0) >= HIGH or attrs.get("engage", 0) >= HIGH
+                )
 
         elif lane == "gold":
             # Gold needs late game scaling and DPS
-            return power.get("late_game", 0) >= HIGH and combat.get("dps", 0) >= HIGH
+            def check(hero: Dict[str, Any]) -> bool:
+                attrs = hero["attrs"]
+                return (
+                    attrs.get("late_game", 0) >= HIGH and attrs.get("dps", 0) >= HIGH
+                )
 
         elif lane == "roam":
             # Roam needs CC or team support
-            return (
-                util.get("crowd_control", 0) >= HIGH
-                or util.get("team_heal", 0) >= 3
-                or util.get("team_buff", 0) >= 3
-            )
+            def check(hero: Dict[str, Any]) -> bool:
+                attrs = hero["attrs"]
+                return (
+                    attrs.get("crowd_control", 0) >= HIGH
+                    or attrs.get("team_heal", 0) >= 3
+                    or attrs.get("team_buff", 0) >= 3
+                )
 
-        return False
+        else:
 
-    def _describe_gap_covered(
-        self,
-        hero: Dict[str, Any],
-        team_stats: Dict[str, float],
-        lane: str,
-    ) -> str:
+            def check(hero: Dict[str, Any]) -> bool:
+                return False
+
+        return check
+
+    def _describe_gap_covered(self, hero: Dict[str, Any], lane: str) -> str:
         """Return a short description of which gap this hero covers"""
-        gap_descriptions = {
-            "jungle": "Provides burst damage & mobility for jungle",
-            "mid": "Provides magic damage and CC from mid",
-            "exp": "Provides frontline tankiness and engage",
-            "gold": "Strong late-game scaling carry",
-            "roam": "Provides CC and team support from roam",
-        }
-        return gap_descriptions.get(lane, "Fills critical team gap")
+        return self.GAP_DESCRIPTIONS.get(lane, "Fills critical team gap")
 
     # ─────────────────────────────────────────────────────────────────────────
     # REASON BUILDING
@@ -16,6 +16,40 @@ logger = logging.getLogger(__name__)
 class LaneSelector:
     """Selects the most important empty lane to fill next"""
 
+    # What each lane typically contributes to the team
+    _lane_contributions = {
+        "exp": {
+            "provides": "tankiness and engage",
+            "check": lambda s: s["tankiness"] < DraftConfig.TARGET_TANKINESS
+            or s["engage"] < DraftConfig.TARGET_ENGAGE,
+        },
+        "jungle": {
+            "provides": "burst damage and mobility",
+            "check": lambda s: s["burst"] < 8 or s["mobility"] < 6,
+        },
+        "mid": {
+            "provides": "magic damage and CC",
+            "check": lambda s: s["magic_damage"] < DraftConfig.TARGET_MAGIC_DAMAGE
+            or s["crowd_control"] < DraftConfig.TARGET_CROWD_CONTROL,
+        },
+        "gold": {
+            "provides": "physical damage and late game",
+            "check": lambda s: s["physical_damage"]
+            < DraftConfig.TARGET_PHYSICAL_DAMAGE,
+        },
+        "roam": {
+            "provides": "CC and team support",
+            "check": lambda s: s["crowd_control"] < DraftConfig.TARGET_CROWD_CONTROL
+            or s["engage"] < DraftConfig.TARGET_ENGAGE,
+        },
+    }
+
+    # Factor 1 of _score_lane (base importance scaled to 0-50), per lane
+    _importance_scores = {
+        lane: (importance / 100.0) * 50
+        for lane, importance in DraftConfig.LANE_IMPORTANCE.items()
+    }
+
     def __init__(self):
         self.config = DraftConfig()
         self.team_analyzer = TeamAnalyzer()
@@ -43,7 +77,8 @@ class LaneSelector:
         """
         # Step 1: Identify filled and empty lanes
         filled_lanes = self.team_analyzer.identify_filled_lanes(ally_picks, heroes_data)
-        empty_lanes = [l for l in self.config.ALL_LANES if l not in filled_lanes]
+        filled = frozenset(filled_lanes)
+        empty_lanes = [l for l in self.config.ALL_LANES if l not in filled]
 
         logger.info(
             f"Draft state: {len(ally_picks)} ally picks, {len(enemy_picks)} enemy picks"
@@ -103,9 +138,8 @@ class LaneSelector:
         2. Enemy threat      (30% weight) - Dangerous enemy in this lane?
         3. Team need         (20% weight) - Does our team lack what this lane provides?
         """
-        # Factor 1: Base lane importance (normalized to 0-1)
-        base_importance = self.config.LANE_IMPORTANCE.get(lane, 50) / 100.0
-        importance_score = base_importance * 50  # Scale to 0-50
+        # Factor 1: Base lane importance (normalized to 0-1, scaled to 0-50)
+        importance_score = self._importance_scores.get(lane, 25.0)
 
         # Factor 2: Enemy threat in this lane
         enemy_threat = self.team_analyzer.assess_enemy_lane_threat(
@@ -141,35 +175,7 @@ class LaneSelector:
 
         team_stats = self.team_analyzer._analyze_team_stats(ally_picks, heroes_data)
 
-        # What each lane typically contributes to the team
-        lane_contributions = {
-            "exp": {
-                "provides": "tankiness and engage",
-                "check": lambda s: s["tankiness"] < self.config.TARGET_TANKINESS
-                or s["engage"] < self.config.TARGET_ENGAGE,
-            },
-            "jungle": {
-                "provides": "burst damage and mobility",
-                "check": lambda s: s["burst"] < 8 or s["mobility"] < 6,
-            },
-            "mid": {
-                "provides": "magic damage and CC",
-                "check": lambda s: s["magic_damage"] < self.config.TARGET_MAGIC_DAMAGE
-                or s["crowd_control"] < self.config.TARGET_CROWD_CONTROL,
-            },
-            "gold": {
-                "provides": "physical damage and late game",
-                "check": lambda s: s["physical_damage"]
-                < self.config.TARGET_PHYSICAL_DAMAGE,
-            },
-            "roam": {
-                "provides": "CC and team support",
-                "check": lambda s: s["crowd_control"] < self.config.TARGET_CROWD_CONTROL
-                or s["engage"] < self.config.TARGET_ENGAGE,
-            },
-        }
-
-        contribution = lane_contributions.get(lane)
+        contribution = self._lane_contributions.get(lane)
         if not contribution:
             return 0.5
 
@@ -190,17 +196,13 @@ class LaneSelector:
         heroes_data: Dict[str, Dict[str, Any]],
     ) -> List[str]:
         """Find enemy heroes assigned to this lane"""
-        lane_name = self.config.ROLE_MAP.get(lane, lane)
-        result = []
-        for enemy_name in enemy_picks:
-            if enemy_name in heroes_data:
-                meta = heroes_data[enemy_name].get("meta", {})
-                lanes = (
-                    meta.get("attributes", {}).get("roles", {}).get("lane_priority", [])
-                )
-                if lane_name in lanes:
-                    result.append(enemy_name)
-        return result
+        lane_bit = self.config.LANE_BITS.get(lane, 0)
+        return [
+            enemy_name
+            for enemy_name in enemy_picks
+            if enemy_name in heroes_data
+            and heroes_data[enemy_name]["lane_mask"] & lane_bit
+        ]
 
     def _build_reasoning(
         self,
@@ -219,7 +221,6 @@ class LaneSelector:
         if len(empty_lanes) == 1:
             parts.append(f"Last empty lane: {lane_name}")
         else:
-            importance = self.config.LANE_IMPORTANCE.get(lane, 0)
             other_empty = [self.config.ROLE_MAP[l] for l in empty_lanes if l != lane]
             parts.append(f"Filling {lane_name} (highest priority empty lane)")
             if other_empty:
@@ -3,20 +3,103 @@ Team Analyzer
 Analyzes team composition and identifies critical gaps.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
 import logging
+from collections import Counter
 
 from app.services.config.draft_config import DraftConfig
 
 logger = logging.getLogger(__name__)
 
 
+def _build_gap_points(gap_rules: Tuple[Tuple[Any, ...], ...]) -> List[int]:
+    """Sum of gap rule points for each subset of gap_rules"""
+    points = [0] * (1 << len(gap_rules))
+    for mask in range(1, len(points)):
+        low_bit = mask & -mask
+        points[mask] = points[mask ^ low_bit] + gap_rules[low_bit.bit_length() - 1][2]
+    return points
+
+
 class TeamAnalyzer:
     """Analyzes team composition and identifies gaps"""
 
+    # Max ally combinations remembered per memo before it is reset
+    MEMO_SIZE = 64
+
+    # Keys of the _analyze_team_stats dict, in per-hero contribution order
+    TEAM_STAT_KEYS = (
+        "tankiness",
+        "physical_damage",
+        "magic_damage",
+        "crowd_control",
+        "mobility",
+        "engage",
+        "peel",
+        "burst",
+        "sustained",
+        "waveclear",
+    )
+
+    # Composition gap rubric, one rule per bit (see open_gaps for when each
+    # gap counts as open). A hero fills a gap when its test passes:
+    # ("attr", stat, minimum) or ("role", primary roles).
+    GAP_RULES = (
+        ("tankiness", ("attr", "tankiness", 4), 15),
+        ("magic_damage", ("role", frozenset({"Mage"})), 15),
+        (
+            "physical_damage",
+            ("role", frozenset({"Marksman", "Assassin", "Fighter"})),
+            15,
+        ),
+        ("crowd_control", ("attr", "crowd_control", 3), 10),
+        ("engage", ("attr", "engage", 4), 12),
+        ("waveclear", ("attr", "waveclear", 4), 8),
+        ("peel", ("attr", "peel", 3), 10),
+    )
+
+    # Points for every combination of gap rules, indexed by bitmask
+    _gap_points = _build_gap_points(GAP_RULES)
+
     def __init__(self):
         self.config = DraftConfig()
 
+        # Per-ally-team results, valid for one heroes_data object (see _memo)
+        self._memo_source: Optional[Dict[str, Dict[str, Any]]] = None
+        self._filled_memo: Dict[Tuple[str, ...], List[str]] = {}
+        self._stats_memo: Dict[Tuple[str, ...], Dict[str, float]] = {}
+        self._roles_memo: Dict[Tuple[str, ...], Counter] = {}
+        self._contribution_memo: Dict[str, Tuple[float, ...]] = {}
+        self._gap_fill_memo: Dict[str, int] = {}
+        self._threat_memo: Dict[str, float] = {}
+
+    def _memo(
+        self, memo: Dict[Tuple[str, ...], Any], heroes_data: Dict[str, Dict[str, Any]]
+    ) -> Dict[Tuple[str, ...], Any]:
+        """
+        Return a per-ally-team memo, emptied first if heroes_data changed
+        (see _sync_memos) or if it has grown too big.
+        """
+        if not self._sync_memos(heroes_data) and len(memo) >= self.MEMO_SIZE:
+            memo.clear()
+        return memo
+
+    def _sync_memos(self, heroes_data: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Drop every memo if heroes_data is a different object than the one
+        cached results were computed from. Returns True if they were dropped.
+        """
+        if heroes_data is self._memo_source:
+            return False
+        self._memo_source = heroes_data
+        self._filled_memo.clear()
+        self._stats_memo.clear()
+        self._roles_memo.clear()
+        self._contribution_memo.clear()
+        self._gap_fill_memo.clear()
+        self._threat_memo.clear()
+        return True
+
     # ─────────────────────────────────────────────────────────────────────────
     # LANE IDENTIFICATION
     # ─────────────────────────────────────────────────────────────────────────
@@ -31,22 +114,22 @@ class TeamAnalyzer:
 
         Returns list of filled lane codes (exp, jungle, mid, gold, roam).
         """
+        memo = self._memo(self._filled_memo, heroes_data)
+        key = tuple(ally_picks)
+        if key in memo:
+            return list(memo[key])
+
         filled = set()
 
         for hero_name in ally_picks:
             if hero_name in heroes_data:
-                hero = heroes_data[hero_name]
-                meta = hero.get("meta", {})
-                lanes = (
-                    meta.get("attributes", {}).get("roles", {}).get("lane_priority", [])
-                )
-
-                if lanes:
-                    primary = lanes[0]
-                    code = self._lane_name_to_code(primary)
+                code = heroes_data[hero_name]["primary_lane"]
+
+                if code is not None:
                     filled.add(code)
-                    logger.debug(f"  {hero_name} → {primary} ({code})")
+                    logger.debug(f"  {hero_name} → {code}")
 
+        memo[key] = list(filled)
         return list(filled)
 
     def identify_open_lanes(
@@ -55,7 +138,7 @@ class TeamAnalyzer:
         heroes_data: Dict[str, Dict[str, Any]],
     ) -> List[str]:
         """Return lane codes that are NOT yet filled"""
-        filled = self.identify_filled_lanes(ally_picks, heroes_data)
+        filled = frozenset(self.identify_filled_lanes(ally_picks, heroes_data))
         return [lane for lane in self.config.ALL_LANES if lane not in filled]
 
     def identify_missing_roles(
@@ -82,51 +165,85 @@ class TeamAnalyzer:
         Returns a dict with totals for:
         tankiness, physical_damage, magic_damage,
         crowd_control, mobility, engage, peel, burst, sustained
+
+        Results are memoized per ally team; treat the dict as read-only.
         """
-        team_stats = {
-            "tankiness": 0.0,
-            "physical_damage": 0.0,
-            "magic_damage": 0.0,
-            "crowd_control": 0.0,
-            "mobility": 0.0,
-            "engage": 0.0,
-            "peel": 0.0,
-            "burst": 0.0,
-            "sustained": 0.0,
-            "waveclear": 0.0,
-        }
+        memo = self._memo(self._stats_memo, heroes_data)
+        key = tuple(ally_picks)
+        if key in memo:
+            return memo[key]
+
+        contributions = [
+            self._team_contribution(ally_name, heroes_data)
+            for ally_name in ally_picks
+            if ally_name in heroes_data
+        ]
+        if contributions:
+            totals = [sum(column, 0.0) for column in zip(*contributions)]
+        else:
+            totals = [0.0] * len(self.TEAM_STAT_KEYS)
+        team_stats = dict(zip(self.TEAM_STAT_KEYS, totals))
+
+        memo[key] = team_stats
+        return team_stats
 
-        for ally_name in ally_picks:
-            if ally_name not in heroes_data:
-                continue
+    def _ally_role_counts(
+        self,
+        ally_picks: List[str],
+        heroes_data: Dict[str, Dict[str, Any]],
+    ) -> Counter:
+        """Primary role -> number of allies with it (memoized per ally team)"""
+        memo = self._memo(self._roles_memo, heroes_data)
+        key = tuple(ally_picks)
+        counts = memo.get(key)
+        if counts is None:
+            counts = memo[key] = Counter(
+                heroes_data[a]["primary_role"] for a in ally_picks if a in heroes_data
+            )
+        return counts
+
+    def stacked_roles(
+        self,
+        ally_picks: List[str],
+        heroes_data: Dict[str, Dict[str, Any]],
+    ) -> FrozenSet[str]:
+        """
+        Primary roles already held by 2+ allies (role redundancy penalty).
 
-            ally = heroes_data[ally_name]
-            meta = ally.get("meta", {})
-            attrs = meta.get("attributes", {})
-
-            combat = attrs.get("combat", {})
-            surv = attrs.get("survivability", {})
-            util = attrs.get("utility", {})
-            range_style = attrs.get("range_playstyle", {})
-            roles = attrs.get("roles", {})
-
-            team_stats["tankiness"] += surv.get("tankiness", 0)
-            team_stats["crowd_control"] += util.get("crowd_control", 0)
-            team_stats["mobility"] += surv.get("mobility", 0)
-            team_stats["engage"] += range_style.get("engage", 0)
-            team_stats["peel"] += range_style.get("peel", 0)
-            team_stats["burst"] += combat.get("burst_damage", 0)
-            team_stats["sustained"] += combat.get("sustained_damage", 0)
-            team_stats["waveclear"] += range_style.get("waveclear", 0)
+        Depends only on the ally team, so it is evaluated once per batch.
+        """
+        counts = self._ally_role_counts(ally_picks, heroes_data)
+        return frozenset(role for role, count in counts.items() if count >= 2)
 
+    def _team_contribution(
+        self, hero_name: str, heroes_data: Dict[str, Dict[str, Any]]
+    ) -> Tuple[float, ...]:
+        """
+        What one hero adds to the team stats, in TEAM_STAT_KEYS order.
+        Memoized per hero for the current heroes_data.
+        """
+        self._sync_memos(heroes_data)
+        contribution = self._contribution_memo.get(hero_name)
+        if contribution is None:
+            hero = heroes_data[hero_name]
+            attrs = hero["attrs"]
+            dps = attrs.get("dps", 0)
             # Separate physical and magic damage
-            role = roles.get("primary_role", "")
-            if role == "Mage":
-                team_stats["magic_damage"] += combat.get("dps", 0)
-            else:
-                team_stats["physical_damage"] += combat.get("dps", 0)
-
-        return team_stats
+            is_mage = hero["primary_role"] == "Mage"
+            contribution = (
+                attrs.get("tankiness", 0),
+                0 if is_mage else dps,
+                dps if is_mage else 0,
+                attrs.get("crowd_control", 0),
+                attrs.get("mobility", 0),
+                attrs.get("engage", 0),
+                attrs.get("peel", 0),
+                attrs.get("burst_damage", 0),
+                attrs.get("sustained_damage", 0),
+                attrs.get("waveclear", 0),
+            )
+            self._contribution_memo[hero_name] = contribution
+        return contribution
 
     # ─────────────────────────────────────────────────────────────────────────
     # COMPOSITION GAP SCORING
@@ -137,86 +254,36 @@ class TeamAnalyzer:
         hero: Dict[str, Any],
         ally_picks: List[str],
         heroes_data: Dict[str, Dict[str, Any]],
+        team_stats: Optional[Dict[str, float]] = None,
+        open_gaps: Optional[int] = None,
+        stacked_roles: Optional[FrozenSet[str]] = None,
     ) -> float:
         """
         Score how well this hero fills team composition gaps (0-100).
 
         Checks: tankiness, magic damage, physical damage,
                 CC, engage, waveclear, peel, role redundancy.
+
+        team_stats, open_gaps and stacked_roles can be passed in when scoring
+        many heroes against the same ally picks; otherwise they are computed
+        here.
         """
-        hero_meta = hero.get("meta", {})
-        attrs = hero_meta.get("attributes", {})
-
-        combat = attrs.get("combat", {})
-        surv = attrs.get("survivability", {})
-        util = attrs.get("utility", {})
-        range_style = attrs.get("range_playstyle", {})
-        roles = attrs.get("roles", {})
-
-        team_stats = self._analyze_team_stats(ally_picks, heroes_data)
-
-        gaps_filled = 0
-        max_gaps = 0
-
-        # Tankiness gap
-        if (
-            len(ally_picks) >= 2
-            and team_stats["tankiness"] < self.config.TARGET_TANKINESS
-        ):
-            max_gaps += 15
-            if surv.get("tankiness", 0) >= 4:
-                gaps_filled += 15
-
-        # Magic damage gap
-        if team_stats["magic_damage"] < self.config.TARGET_MAGIC_DAMAGE:
-            max_gaps += 15
-            if roles.get("primary_role") == "Mage":
-                gaps_filled += 15
-
-        # Physical damage gap
-        if team_stats["physical_damage"] < self.config.TARGET_PHYSICAL_DAMAGE:
-            max_gaps += 15
-            if roles.get("primary_role") in ["Marksman", "Assassin", "Fighter"]:
-                gaps_filled += 15
-
-        # CC gap
-        if team_stats["crowd_control"] < self.config.TARGET_CROWD_CONTROL:
-            max_gaps += 10
-            if util.get("crowd_control", 0) >= 3:
-                gaps_filled += 10
-
-        # Engage gap
-        if team_stats["engage"] < self.config.TARGET_ENGAGE:
-            max_gaps += 12
-            if range_style.get("engage", 0) >= 4:
-                gaps_filled += 12
-
-        # Waveclear gap
-        if team_stats["waveclear"] < self.config.TARGET_WAVECLEAR:
-            max_gaps += 8
-            if range_style.get("waveclear", 0) >= 4:
-                gaps_filled += 8
-
-        # Peel gap (if team has carries that need protection)
-        if team_stats["sustained"] >= 12 and team_stats["peel"] < 6:
-            max_gaps += 10
-            if range_style.get("peel", 0) >= 3:
-                gaps_filled += 10
+        if team_stats is None:
+            team_stats = self._analyze_team_stats(ally_picks, heroes_data)
+
+        if open_gaps is None:
+            open_gaps = self.open_gaps(ally_picks, team_stats)
+
+        if stacked_roles is None:
+            stacked_roles = self.stacked_roles(ally_picks, heroes_data)
+
+        max_gaps = self._gap_points[open_gaps]
+        gaps_filled = self._gap_points[
+            open_gaps & self._gap_fill_mask(hero["name"], heroes_data)
+        ]
 
         # Role redundancy penalty
-        hero_role = roles.get("primary_role", "")
-        role_count = sum(
-            1
-            for a in ally_picks
-            if a in heroes_data
-            and heroes_data[a]
-            .get("meta", {})
-            .get("attributes", {})
-            .get("roles", {})
-            .get("primary_role")
-            == hero_role
-        )
-        if role_count >= 2:
+        if hero["primary_role"] in stacked_roles:
             gaps_filled -= self.config.ROLE_REDUNDANCY_PENALTY
 
         if max_gaps == 0:
@@ -225,6 +292,51 @@ class TeamAnalyzer:
         score = (gaps_filled / max_gaps) * 100
         return max(min(score, 100), 0)
 
+    def open_gaps(self, ally_picks: List[str], team_stats: Dict[str, float]) -> int:
+        """
+        GAP_RULES bitmask of the gaps this ally team has open.
+
+        Depends only on the ally team, so it is evaluated once per batch.
+        """
+        peel_needed = team_stats["sustained"] >= 12  # carries need protection
+        checks = {
+            "tankiness": len(ally_picks) >= 2
+            and team_stats["tankiness"] < self.config.TARGET_TANKINESS,
+            "magic_damage": team_stats["magic_damage"]
+            < self.config.TARGET_MAGIC_DAMAGE,
+            "physical_damage": team_stats["physical_damage"]
+            < self.config.TARGET_PHYSICAL_DAMAGE,
+            "crowd_control": team_stats["crowd_control"]
+            < self.config.TARGET_CROWD_CONTROL,
+            "engage": team_stats["engage"] < self.config.TARGET_ENGAGE,
+            "waveclear": team_stats["waveclear"] < self.config.TARGET_WAVECLEAR,
+            "peel": peel_needed and team_stats["peel"] < 6,
+        }
+        mask = 0
+        for bit, (gap, _, _) in enumerate(self.GAP_RULES):
+            if checks[gap]:
+                mask |= 1 << bit
+        return mask
+
+    def _gap_fill_mask(
+        self, hero_name: str, heroes_data: Dict[str, Dict[str, Any]]
+    ) -> int:
+        """GAP_RULES bitmask of the gaps this hero fills (memoized per hero)"""
+        self._sync_memos(heroes_data)
+        mask = self._gap_fill_memo.get(hero_name)
+        if mask is None:
+            hero = heroes_data[hero_name]
+            mask = 0
+            for bit, (_, test, _) in enumerate(self.GAP_RULES):
+                if test[0] == "attr":
+                    fills = hero["attrs"].get(test[1], 0) >= test[2]
+                else:
+                    fills = hero["primary_role"] in test[1]
+                if fills:
+                    mask |= 1 << bit
+            self._gap_fill_memo[hero_name] = mask
+        return mask
+
     # ─────────────────────────────────────────────────────────────────────────
     # ENEMY THREAT ASSESSMENT
     # ─────────────────────────────────────────────────────────────────────────
@@ -240,31 +352,17 @@ class TeamAnalyzer:
 
         Higher score = more important to counter this lane.
         """
-        lane_name = self.config.ROLE_MAP.get(lane, lane)
+        self._sync_memos(heroes_data)
         threat_score = 0.0
         enemy_count = 0
+        lane_bit = self.config.LANE_BITS.get(lane, 0)
 
         for enemy_name in enemy_picks:
             if enemy_name not in heroes_data:
                 continue
 
-            enemy = heroes_data[enemy_name]
-            meta = enemy.get("meta", {})
-            attrs = meta.get("attributes", {})
-            lanes = attrs.get("roles", {}).get("lane_priority", [])
-
-            if lane_name in lanes:
-                combat = attrs.get("combat", {})
-                power = attrs.get("power_curve", {})
-
-                # Threat = DPS + burst + late game (normalized 0-1)
-                strength = (
-                    combat.get("dps", 0) * 0.4
-                    + combat.get("burst_damage", 0) * 0.3
-                    + power.get("late_game", 0) * 0.3
-                ) / 5.0
-
-                threat_score += strength
+            if heroes_data[enemy_name]["lane_mask"] & lane_bit:
+                threat_score += self._threat_strength(enemy_name, heroes_data)
                 enemy_count += 1
 
         if enemy_count == 0:
@@ -272,6 +370,23 @@ class TeamAnalyzer:
 
         return threat_score / enemy_count
 
+    def _threat_strength(
+        self, hero_name: str, heroes_data: Dict[str, Dict[str, Any]]
+    ) -> float:
+        """Lane threat a hero poses (0-1), memoized per hero"""
+        strength = self._threat_memo.get(hero_name)
+        if strength is None:
+            attrs = heroes_data[hero_name]["attrs"]
+
+            # Threat = DPS + burst + late game (normalized 0-1)
+            strength = (
+                attrs.get("dps", 0) * 0.4
+                + attrs.get("burst_damage", 0) * 0.3
+                + attrs.get("late_game", 0) * 0.3
+            ) / 5.0
+            self._threat_memo[hero_name] = strength
+        return strength
+
     # ─────────────────────────────────────────────────────────────────────────
     # HELPERS
     # ─────────────────────────────────────────────────────────────────────────
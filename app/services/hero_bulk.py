@@ -0,0 +1,47 @@
+"""
+Hero Bulk Fetch
+Batched, read-only hero lookups shared by the diagnostic scripts.
+"""
+
+import functools
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, Tuple
+
+from sqlalchemy import select
+
+from app.db.database import engine
+from app.db.models import Hero
+
+# {field label: path into meta_json}, e.g. {"tankiness": ("attributes", "survivability", "tankiness")}
+MetaFields = Mapping[str, Tuple[str, ...]]
+
+
+def hero_bulk_fetch(
+    names: Iterable[str], fields: MetaFields
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Get the given meta fields for the named heroes in one IN query.
+
+    Values are extracted by the database (None where a path is missing);
+    heroes not in the table are left out. Runs on a plain Core connection:
+    nothing here needs ORM entities or a unit of work. Results are cached
+    per process for each (names, fields) combination and must be treated
+    as read-only.
+
+    Returns:
+        {hero name: {field label: value}}
+    """
+    return _fetch(frozenset(names), tuple(fields.items()))
+
+
+@functools.lru_cache(maxsize=32)
+def _fetch(
+    names: FrozenSet[str], fields: Tuple[Tuple[str, Tuple[str, ...]], ...]
+) -> Dict[str, Dict[str, Any]]:
+    labels = [label for label, _ in fields]
+    columns = [Hero.meta_json[path].label(label) for label, path in fields]
+
+    stmt = select(Hero.name, *columns).where(Hero.name.in_(names))
+    with engine.connect() as conn:
+        rows = conn.execute(stmt).all()
+
+    return {row[0]: dict(zip(labels, row[1:])) for row in rows}
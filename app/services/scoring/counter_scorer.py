@@ -3,7 +3,7 @@ Counter Scorer
 Evaluates how well a hero counters the enemy team composition
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 
 from ..config.draft_config import DraftConfig
@@ -16,12 +16,119 @@ class CounterScorer:
 
     def __init__(self):
         self.config = DraftConfig()
+        # Enemy-side flags and hero-side bonuses per hero name, filled lazily
+        # (see clear_cache)
+        self._enemy_profiles: Dict[str, Tuple[int, ...]] = {}
+        self._hero_bonus_cache: Dict[str, Tuple[Any, ...]] = {}
+        # Counter score against the most recent enemy team, by hero bonuses -
+        # heroes with the same bonuses score the same against a given team
+        self._team_key: Tuple[Tuple[int, ...], ...] = ()
+        self._team_scores: Dict[Tuple[Any, ...], float] = {}
+
+    def clear_cache(self):
+        """Drop memoized per-hero data (call whenever heroes_data is reloaded)"""
+        self._enemy_profiles.clear()
+        self._hero_bonus_cache.clear()
+        self._team_key = ()
+        self._team_scores = {}
+
+    def _enemy_profile(
+        self, enemy_name: str, heroes_data: Dict[str, Dict[str, Any]]
+    ) -> Tuple[int, ...]:
+        """
+        Which counter conditions an enemy triggers, evaluated once per hero.
+
+        Returns (squishy, tanky, cc_level, short_range, low_mobility, low_defense)
+        where cc_level is 2 for heavy lockdown (cc >= 4), 1 for cc >= 3, else 0
+        and the other entries are 0/1 flags.
+        """
+        profile = self._enemy_profiles.get(enemy_name)
+        if profile is None:
+            HIGH = self.config.HIGH_STAT_THRESHOLD
+            MID = self.config.MID_STAT_THRESHOLD
+            LOW = self.config.LOW_STAT_THRESHOLD
+
+            enemy = heroes_data[enemy_name]["attrs"]
+            tankiness = enemy.get("tankiness", 3)
+            cc = enemy.get("crowd_control", 0)
+            defense = enemy.get("shields", 0) + enemy.get("regen", 0)
+            profile = (
+                int(tankiness <= LOW),
+                int(tankiness >= HIGH),
+                2 if cc >= HIGH else 1 if cc >= MID else 0,
+                int(enemy.get("range", 3) <= LOW),
+                int(enemy.get("mobility", 3) <= LOW),
+                int(defense <= self.config.LOW_DEFENSE_THRESHOLD),
+            )
+            self._enemy_profiles[enemy_name] = profile
+        return profile
+
+    def resolve_enemies(
+        self, enemy_picks: List[str], heroes_data: Dict[str, Dict[str, Any]]
+    ) -> Tuple[Tuple[int, ...], ...]:
+        """Enemy profiles for the known heroes in enemy_picks, in pick order"""
+        return tuple(
+            self._enemy_profile(enemy_name, heroes_data)
+            for enemy_name in enemy_picks
+            if enemy_name in heroes_data
+        )
+
+    def _hero_bonuses(self, hero: Dict[str, Any]) -> Tuple[Any, ...]:
+        """
+        Points the hero earns for each counter condition an enemy triggers.
+
+        Returns (vs_squishy, vs_tanky, vs_cc_by_level, vs_short_range,
+                 vs_low_mobility, vs_low_defense); vs_cc_by_level is indexed
+        by the enemy's cc_level. Depends only on the hero, so it is memoized.
+        """
+        bonuses = self._hero_bonus_cache.get(hero["name"])
+        if bonuses is None:
+            bonuses = self._compute_bonuses(hero["attrs"])
+            self._hero_bonus_cache[hero["name"]] = bonuses
+        return bonuses
+
+    def _compute_bonuses(self, attrs: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Build the _hero_bonuses tuple from a hero's flat attributes"""
+        anti_squishy = attrs.get("anti_squishy", 0)
+        anti_tank = attrs.get("anti_tank", 0)
+        evasion = max(attrs.get("mobility", 0), attrs.get("escape", 0))
+        poke = attrs.get("poke", 0)
+        engage = attrs.get("engage", 0)
+        burst = attrs.get("burst_damage", 0)
+        HIGH = self.config.HIGH_STAT_THRESHOLD
+        MID = self.config.MID_STAT_THRESHOLD
+
+        # Mobility vs lockdown: 20 for an evasive hero vs heavy CC, else 10
+        # when both sides clear the lower bar
+        vs_cc = (
+            0,
+            10 if evasion >= MID else 0,
+            20 if evasion >= HIGH else 10 if evasion >= MID else 0,
+        )
+
+        return (
+            self._tiered(anti_squishy, 5, 3),
+            self._tiered(anti_tank, 5, 3),
+            vs_cc,
+            self._tiered(poke, 4, 2),
+            engage * 4 if engage >= HIGH else 0,
+            self._tiered(burst, 4, 2),
+        )
+
+    def _tiered(self, stat: float, high: int, mid: int) -> float:
+        """stat * high for a high stat, stat * mid for a mid one, else nothing"""
+        if stat >= self.config.HIGH_STAT_THRESHOLD:
+            return stat * high
+        if stat >= self.config.MID_STAT_THRESHOLD:
+            return stat * mid
+        return 0
 
     def calculate_counter_score(
         self,
         hero: Dict[str, Any],
         enemy_picks: List[str],
         heroes_data: Dict[str, Dict[str, Any]],
+        enemy_profiles: Optional[Tuple[Tuple[int, ...], ...]] = None,
     ) -> float:
         """
         Calculate how well hero counters enemy team (0-100)
@@ -34,87 +141,70 @@ class CounterScorer:
         - High engage vs low mobility enemies
         - High burst vs low defense enemies
 
+        Each enemy contributes the sum of the hero's bonuses for the
+        conditions it triggers (capped at 100); the score is the average.
+
         Args:
             hero: Hero data dictionary
             enemy_picks: List of enemy hero names
             heroes_data: Dictionary of all heroes' data
+            enemy_profiles: resolve_enemies() output, when scoring many heroes
+                against the same enemy picks
 
         Returns:
             Counter score 0-100
         """
-        if not enemy_picks:
+        if enemy_profiles is None:
+            enemy_profiles = self.resolve_enemies(enemy_picks, heroes_data)
+        if not enemy_profiles:
             return 60.0  # Neutral score
 
-        hero_meta = hero.get("meta", {})
-        combat = hero_meta.get("attributes", {}).get("combat", {})
-        survivability = hero_meta.get("attributes", {}).get("survivability", {})
-        utility = hero_meta.get("attributes", {}).get("utility", {})
-        range_style = hero_meta.get("attributes", {}).get("range_playstyle", {})
+        if enemy_profiles != self._team_key:
+            self._team_key = enemy_profiles
+            self._team_scores = {}
+
+        bonuses = self._hero_bonuses(hero)
+        counter_score = self._team_scores.get(bonuses)
+        if counter_score is None:
+            counter_score = self._score_against(bonuses, enemy_profiles)
+            self._team_scores[bonuses] = counter_score
+        return counter_score
+
+    def _score_against(
+        self,
+        bonuses: Tuple[Any, ...],
+        enemy_profiles: Tuple[Tuple[int, ...], ...],
+    ) -> float:
+        """Average capped counter points of _hero_bonuses() over the enemies"""
+        (
+            vs_squishy,
+            vs_tanky,
+            vs_cc,
+            vs_short_range,
+            vs_low_mobility,
+            vs_low_defense,
+        ) = bonuses
 
         total_counter_score = 0
-        enemy_count = 0
-
-        for enemy_name in enemy_picks:
-            if enemy_name not in heroes_data:
-                continue
-
-            enemy = heroes_data[enemy_name]
-            enemy_meta = enemy.get("meta", {})
-            enemy_combat = enemy_meta.get("attributes", {}).get("combat", {})
-            enemy_surv = enemy_meta.get("attributes", {}).get("survivability", {})
-            enemy_util = enemy_meta.get("attributes", {}).get("utility", {})
-            enemy_range = enemy_meta.get("attributes", {}).get("range_playstyle", {})
-
-            counter_points = 0
-
-            # Anti-squishy vs squishy enemies
-            enemy_tankiness = enemy_surv.get("tankiness", 3)
-            hero_anti_squishy = combat.get("anti_squishy", 0)
-            if enemy_tankiness <= 2 and hero_anti_squishy >= 4:
-                counter_points += hero_anti_squishy * 5
-            elif enemy_tankiness <= 2 and hero_anti_squishy >= 3:
-                counter_points += hero_anti_squishy * 3
-
-            # Anti-tank vs tanky enemies
-            hero_anti_tank = combat.get("anti_tank", 0)
-            if enemy_tankiness >= 4 and hero_anti_tank >= 4:
-                counter_points += hero_anti_tank * 5
-            elif enemy_tankiness >= 4 and hero_anti_tank >= 3:
-                counter_points += hero_anti_tank * 3
-
-            # Mobility vs lockdown
-            enemy_cc = enemy_util.get("crowd_control", 0)
-            hero_mobility = survivability.get("mobility", 0)
-            hero_escape = survivability.get("escape", 0)
-            if enemy_cc >= 4 and (hero_mobility >= 4 or hero_escape >= 4):
-                counter_points += 20
-            elif enemy_cc >= 3 and (hero_mobility >= 3 or hero_escape >= 3):
-                counter_points += 10
-
-            # Poke vs short range
-            enemy_range_val = enemy_range.get("range", 3)
-            hero_poke = combat.get("poke", 0)
-            if enemy_range_val <= 2 and hero_poke >= 4:
-                counter_points += hero_poke * 4
-            elif enemy_range_val <= 2 and hero_poke >= 3:
-                counter_points += hero_poke * 2
-
-            # Engage vs low mobility
-            enemy_mobility = enemy_surv.get("mobility", 3)
-            hero_engage = range_style.get("engage", 0)
-            if enemy_mobility <= 2 and hero_engage >= 4:
-                counter_points += hero_engage * 4
-
-            # Burst damage vs low defense
-            enemy_shields = enemy_surv.get("shields", 0)
-            enemy_regen = enemy_surv.get("regen", 0)
-            hero_burst = combat.get("burst_damage", 0)
-            if (enemy_shields + enemy_regen <= 3) and hero_burst >= 4:
-                counter_points += hero_burst * 4
-            elif (enemy_shields + enemy_regen <= 3) and hero_burst >= 3:
-                counter_points += hero_burst * 2
+
+        for (
+            squishy,
+            tanky,
+            cc_level,
+            short_range,
+            low_mobility,
+            low_defense,
+        ) in enemy_profiles:
+
+            counter_points = (
+                vs_squishy * squishy
+                + vs_tanky * tanky
+                + vs_cc[cc_level]
+                + vs_short_range * short_range
+                + vs_low_mobility * low_mobility
+                + vs_low_defense * low_defense
+            )
 
             total_counter_score += min(counter_points, 100)
-            enemy_count += 1
 
-        return total_counter_score / enemy_count if enemy_count > 0 else 60.0
+        return total_counter_score / len(enemy_profiles)
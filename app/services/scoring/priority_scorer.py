@@ -16,6 +16,21 @@ class PriorityScorer:
 
     def __init__(self):
         self.config = DraftConfig()
+        # Multiplier by number of perfect (5) stats, capped at 5
+        self._perfect_stat_multipliers = (
+            1.0,
+            1.0,
+            1.0,
+            self.config.PERFECT_STAT_PENALTY_3,
+            self.config.PERFECT_STAT_PENALTY_4,
+            self.config.PERFECT_STAT_PENALTY_5,
+        )
+        # Priority depends only on the hero - memoized by name (see clear_cache)
+        self._priority_cache: Dict[str, float] = {}
+
+    def clear_cache(self):
+        """Drop memoized priorities (call whenever heroes_data is reloaded)"""
+        self._priority_cache.clear()
 
     def calculate_pick_priority_score(self, hero: Dict[str, Any]) -> float:
         """
@@ -35,39 +50,39 @@ class PriorityScorer:
         Returns:
             Priority score 0-100
         """
-        hero_meta = hero.get("meta", {})
-        combat = hero_meta.get("attributes", {}).get("combat", {})
-        survivability = hero_meta.get("attributes", {}).get("survivability", {})
-        power_curve = hero_meta.get("attributes", {}).get("power_curve", {})
-        utility = hero_meta.get("attributes", {}).get("utility", {})
+        priority = self._priority_cache.get(hero["name"])
+        if priority is None:
+            priority = self._compute_priority(hero["attrs"])
+            self._priority_cache[hero["name"]] = priority
+        return priority
+
+    def _compute_priority(self, attrs: Dict[str, Any]) -> float:
+        """Uncached calculate_pick_priority_score body"""
+
+        burst = attrs.get("burst_damage", 0)
+        sustained = attrs.get("sustained_damage", 0)
+        dps = attrs.get("dps", 0)
+        aoe = attrs.get("aoe_damage", 0)
+        tankiness = attrs.get("tankiness", 0)
+        mobility = attrs.get("mobility", 0)
+        escape = attrs.get("escape", 0)
 
         # Average combat effectiveness
-        combat_stats = [
-            combat.get("burst_damage", 0),
-            combat.get("sustained_damage", 0),
-            combat.get("dps", 0),
-            combat.get("aoe_damage", 0),
-        ]
-        combat_score = sum(combat_stats) / 4
+        combat_score = (burst + sustained + dps + aoe) / 4
 
         # Survivability score
-        surv_stats = [
-            survivability.get("tankiness", 0),
-            survivability.get("mobility", 0),
-            survivability.get("escape", 0),
-        ]
-        surv_score = sum(surv_stats) / 3
+        surv_score = (tankiness + mobility + escape) / 3
 
         # Power curve - balanced across game stages
         power_score = (
-            power_curve.get("early_game", 0) * 0.2
-            + power_curve.get("mid_game", 0) * 0.35
-            + power_curve.get("late_game", 0) * 0.35
-            + power_curve.get("scaling", 0) * 0.1
+            attrs.get("early_game", 0) * 0.2
+            + attrs.get("mid_game", 0) * 0.35
+            + attrs.get("late_game", 0) * 0.35
+            + attrs.get("scaling", 0) * 0.1
         )
 
         # Utility score
-        utility_score = utility.get("crowd_control", 0)
+        utility_score = attrs.get("crowd_control", 0)
 
         # Combined score with balanced weights
         priority = (
@@ -77,14 +92,18 @@ class PriorityScorer:
             + utility_score * 0.10
         ) * self.config.PRIORITY_SCALE
 
-        # PENALTY: Heroes with suspiciously perfect stats
-        perfect_stat_count = sum(1 for stat in combat_stats + surv_stats if stat >= 5)
-
-        if perfect_stat_count >= 5:
-            priority *= self.config.PERFECT_STAT_PENALTY_5
-        elif perfect_stat_count >= 4:
-            priority *= self.config.PERFECT_STAT_PENALTY_2
-        elif perfect_stat_count >= 3:
-            priority *= self.config.PERFECT_STAT_PENALTY_3
+        # PENALTY: Heroes with suspiciously perfect stats (one bit per
+        # combat/survivability stat at 5)
+        perfect_stats = (
+            (burst >= 5)
+            | (sustained >= 5) << 1
+            | (dps >= 5) << 2
+            | (aoe >= 5) << 3
+            | (tankiness >= 5) << 4
+            | (mobility >= 5) << 5
+            | (escape >= 5) << 6
+        )
+        perfect_stat_count = perfect_stats.bit_count()
+        priority *= self._perfect_stat_multipliers[min(perfect_stat_count, 5)]
 
         return min(priority, 100)
@@ -3,7 +3,7 @@ Synergy Scorer
 Evaluates how well a hero synergizes with the ally team
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 
 from ..config.draft_config import DraftConfig
@@ -11,17 +11,121 @@ from ..config.draft_config import DraftConfig
 logger = logging.getLogger(__name__)
 
 
+def _build_rule_points(rules: Tuple[str, ...]) -> List[int]:
+    """Sum of SYNERGY_SCORING bonuses for each subset of rules"""
+    values = [DraftConfig.SYNERGY_SCORING[rule] for rule in rules]
+    points = [0] * (1 << len(values))
+    for mask in range(1, len(points)):
+        low_bit = mask & -mask
+        points[mask] = points[mask ^ low_bit] + values[low_bit.bit_length() - 1]
+    return points
+
+
 class SynergyScorer:
     """Scores hero's synergy with ally team"""
 
+    # Synergy rules in bit order: bit i of a hero mask means the hero has the
+    # hero-side condition of RULES[i], bit i of an ally mask means the ally
+    # has the matching ally-side condition
+    RULES = (
+        "tank_dps",
+        "engage_aoe",
+        "cc_burst",
+        "peel_squishy",
+        "sustain_fighter",
+        "double_engage",
+        "dive_comp",
+    )
+
+    # Points for every combination of matched rules, indexed by bitmask
+    _rule_points = _build_rule_points(RULES)
+
     def __init__(self):
         self.config = DraftConfig()
+        # Ally-side and hero-side masks per hero name, filled lazily
+        # (see clear_cache)
+        self._ally_masks: Dict[str, int] = {}
+        self._hero_masks: Dict[str, int] = {}
+        # Synergy against the most recent ally team, by hero mask - heroes
+        # with the same mask score the same against a given team
+        self._team_key: Tuple[int, ...] = ()
+        self._team_scores: Dict[int, float] = {}
+
+    def clear_cache(self):
+        """Drop memoized per-hero data (call whenever heroes_data is reloaded)"""
+        self._ally_masks.clear()
+        self._hero_masks.clear()
+        self._team_key = ()
+        self._team_scores = {}
+
+    def _ally_mask(
+        self, ally_name: str, heroes_data: Dict[str, Dict[str, Any]]
+    ) -> int:
+        """
+        Which ally-side synergy conditions an ally satisfies, as a RULES
+        bitmask. Evaluated once per hero.
+        """
+        mask = self._ally_masks.get(ally_name)
+        if mask is None:
+            HIGH = self.config.HIGH_STAT_THRESHOLD
+            LOW = self.config.LOW_STAT_THRESHOLD
+
+            ally = heroes_data[ally_name]["attrs"]
+            mask = (
+                (ally.get("dps", 0) >= HIGH) << 0  # tank_dps
+                | (ally.get("aoe_damage", 0) >= HIGH) << 1  # engage_aoe
+                | (ally.get("burst_damage", 0) >= HIGH) << 2  # cc_burst
+                | (ally.get("tankiness", 3) <= LOW) << 3  # peel_squishy
+                | (ally.get("sustained_damage", 0) >= HIGH) << 4  # sustain_fighter
+                | (ally.get("engage", 0) >= HIGH) << 5  # double_engage
+                | (ally.get("mobility", 0) >= HIGH) << 6  # dive_comp
+            )
+            self._ally_masks[ally_name] = mask
+        return mask
+
+    def resolve_allies(
+        self, ally_picks: List[str], heroes_data: Dict[str, Dict[str, Any]]
+    ) -> Tuple[int, ...]:
+        """Ally masks for the known heroes in ally_picks, in pick order"""
+        return tuple(
+            self._ally_mask(ally_name, heroes_data)
+            for ally_name in ally_picks
+            if ally_name in heroes_data
+        )
+
+    def _hero_mask(self, hero: Dict[str, Any]) -> int:
+        """
+        Which hero-side synergy conditions the hero satisfies, as a RULES
+        bitmask. Memoized per hero.
+        """
+        mask = self._hero_masks.get(hero["name"])
+        if mask is None:
+            HIGH = self.config.HIGH_STAT_THRESHOLD
+            MID = self.config.MID_STAT_THRESHOLD
+
+            attrs = hero["attrs"]
+            engage = attrs.get("engage", 0) >= HIGH
+            sustain = (
+                attrs.get("team_heal", 0) >= MID or attrs.get("team_buff", 0) >= MID
+            )
+            mask = (
+                (attrs.get("tankiness", 0) >= HIGH) << 0  # Tank + damage dealer
+                | engage << 1  # Engage + AoE damage
+                | (attrs.get("crowd_control", 0) >= MID) << 2  # CC + burst damage
+                | (attrs.get("peel", 0) >= MID) << 3  # Peel + squishy carry
+                | sustain << 4  # Sustain support + fighter
+                | engage << 5  # Double engage
+                | (attrs.get("mobility", 0) >= HIGH) << 6  # Mobility (dive comp)
+            )
+            self._hero_masks[hero["name"]] = mask
+        return mask
 
     def calculate_synergy_score(
         self,
         hero: Dict[str, Any],
         ally_picks: List[str],
         heroes_data: Dict[str, Dict[str, Any]],
+        ally_masks: Optional[Tuple[int, ...]] = None,
     ) -> float:
         """
         Calculate synergy with ally team (0-100)
@@ -32,82 +136,37 @@ class SynergyScorer:
         - Tank + hyper carry marksman
         - Peel support + squishy damage dealer
 
+        Each ally contributes the bonuses of every rule where both the hero
+        and the ally meet their side (capped at 100); the score is the average.
+
         Args:
             hero: Hero data dictionary
             ally_picks: List of ally hero names
             heroes_data: Dictionary of all heroes' data
+            ally_masks: resolve_allies() output, when scoring many heroes
+                with the same ally picks
 
         Returns:
             Synergy score 0-100
         """
-        if not ally_picks:
+        if ally_masks is None:
+            ally_masks = self.resolve_allies(ally_picks, heroes_data)
+        if not ally_masks:
             return 60.0
 
-        hero_meta = hero.get("meta", {})
-        combat = hero_meta.get("attributes", {}).get("combat", {})
-        survivability = hero_meta.get("attributes", {}).get("survivability", {})
-        utility = hero_meta.get("attributes", {}).get("utility", {})
-        range_style = hero_meta.get("attributes", {}).get("range_playstyle", {})
-
-        total_synergy = 0
-        ally_count = 0
-
-        for ally_name in ally_picks:
-            if ally_name not in heroes_data:
-                continue
-
-            ally = heroes_data[ally_name]
-            ally_meta = ally.get("meta", {})
-            ally_combat = ally_meta.get("attributes", {}).get("combat", {})
-            ally_surv = ally_meta.get("attributes", {}).get("survivability", {})
-            ally_util = ally_meta.get("attributes", {}).get("utility", {})
-            ally_range = ally_meta.get("attributes", {}).get("range_playstyle", {})
-
-            synergy_points = 0
-
-            # Tank + damage dealer synergy
-            hero_tankiness = survivability.get("tankiness", 0)
-            ally_dps = ally_combat.get("dps", 0)
-            if hero_tankiness >= 4 and ally_dps >= 4:
-                synergy_points += self.config.SYNERGY_SCORING["tank_dps"]
-
-            # Engage + AoE damage synergy
-            hero_engage = range_style.get("engage", 0)
-            ally_aoe = ally_combat.get("aoe_damage", 0)
-            if hero_engage >= 4 and ally_aoe >= 4:
-                synergy_points += self.config.SYNERGY_SCORING["engage_aoe"]
-
-            # CC + burst damage synergy
-            hero_cc = utility.get("crowd_control", 0)
-            ally_burst = ally_combat.get("burst_damage", 0)
-            if hero_cc >= 3 and ally_burst >= 4:
-                synergy_points += self.config.SYNERGY_SCORING["cc_burst"]
-
-            # Peel + squishy carry synergy
-            hero_peel = range_style.get("peel", 0)
-            ally_tankiness = ally_surv.get("tankiness", 3)
-            if hero_peel >= 3 and ally_tankiness <= 2:
-                synergy_points += self.config.SYNERGY_SCORING["peel_squishy"]
-
-            # Sustain support + fighter synergy
-            hero_heal = utility.get("team_heal", 0)
-            hero_buff = utility.get("team_buff", 0)
-            ally_sustained = ally_combat.get("sustained_damage", 0)
-            if (hero_heal >= 3 or hero_buff >= 3) and ally_sustained >= 4:
-                synergy_points += self.config.SYNERGY_SCORING["sustain_fighter"]
-
-            # Double engage synergy
-            ally_engage = ally_range.get("engage", 0)
-            if hero_engage >= 4 and ally_engage >= 4:
-                synergy_points += self.config.SYNERGY_SCORING["double_engage"]
-
-            # Mobility synergy (dive comp)
-            hero_mobility = survivability.get("mobility", 0)
-            ally_mobility = ally_surv.get("mobility", 0)
-            if hero_mobility >= 4 and ally_mobility >= 4:
-                synergy_points += self.config.SYNERGY_SCORING["dive_comp"]
-
-            total_synergy += min(synergy_points, 100)
-            ally_count += 1
-
-        return total_synergy / ally_count if ally_count > 0 else 60.0
+        if ally_masks != self._team_key:
+            self._team_key = ally_masks
+            self._team_scores = {}
+
+        hero_mask = self._hero_mask(hero)
+        synergy = self._team_scores.get(hero_mask)
+        if synergy is None:
+            rule_points = self._rule_points
+
+            total_synergy = 0
+            for ally_mask in ally_masks:
+                total_synergy += min(rule_points[hero_mask & ally_mask], 100)
+
+            synergy = total_synergy / len(ally_masks)
+            self._team_scores[hero_mask] = synergy
+        return synergy
@@ -0,0 +1,3 @@
+"""
+Tools package - diagnostic commands run with `python -m app.tools`
+"""
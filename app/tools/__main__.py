@@ -0,0 +1,74 @@
+"""
+Run the diagnostic scripts in one interpreter:
+
+    python -m app.tools heroes
+    python -m app.tools lanes
+    python -m app.tools draft-test [--workers N]
+    python -m app.tools --all
+
+With --all every check runs in order, so imports, the connection pool and
+the analyzer's hero cache are warmed once instead of once per script.
+Run from the repository root (the scripts live in scripts/).
+"""
+
+import argparse
+
+
+def run_heroes(args):
+    from scripts import check_heroes
+
+    check_heroes.main()
+
+
+def run_lanes(args):
+    from scripts import check_lanes
+
+    check_lanes.main()
+
+
+def run_draft_test(args):
+    from scripts import test_intelligent_draft
+
+    test_intelligent_draft.run(workers=args.workers)
+
+
+COMMANDS = {
+    "heroes": run_heroes,
+    "lanes": run_lanes,
+    "draft-test": run_draft_test,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m app.tools", description="DraftSensei diagnostics"
+    )
+    parser.add_argument(
+        "--all", action="store_true", help="Run every check, in order"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes for the draft scenarios (default: 1, in-process)",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("heroes", help="Compare key stats of selected heroes")
+    subparsers.add_parser("lanes", help="List role and lane priorities")
+    subparsers.add_parser("draft-test", help="Run the draft suggestion scenarios")
+
+    args = parser.parse_args()
+
+    if args.all:
+        commands = list(COMMANDS)
+    elif args.command:
+        commands = [args.command]
+    else:
+        parser.error("a command or --all is required")
+
+    for command in commands:
+        COMMANDS[command](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,236 @@
 Analytics Utility - Performance analytics and insights
 """
 
-from typing import Dict, List, Any, Tuple, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, text
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Any, Optional, Tuple
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import bindparam, func, desc, and_, or_, select, tuple_
 from datetime import datetime, timedelta
-import statistics
+import contextvars
+import copy
+import functools
+import heapq
+import inspect
+import threading
+import time
 
-from ..db.models import Hero, MatchHistory, PlayerPreference
+from ..db.models import Hero, MatchHistory, MatchParticipant, PlayerPreference, hero_by_name
+
+# Hero's primary role, read from meta JSON in the database
+_HERO_ROLE = Hero.meta_json[("attributes", "roles", "primary_role")].as_string()
+
+# Statements built once at import and executed with bound parameters, so
+# every call reuses SQLAlchemy's compiled form
+_HERO_PERFORMANCE_STMT = (
+    select(
+        Hero.name,
+        _HERO_ROLE.label('role'),
+        func.avg(MatchHistory.performance_score).label('avg_performance'),
+        func.count(MatchHistory.id).label('match_count'),
+        func.stddev(MatchHistory.performance_score).label('performance_std'),
+        func.min(MatchHistory.performance_score).label('min_performance'),
+        func.max(MatchHistory.performance_score).label('max_performance')
+    )
+    .join(MatchHistory, Hero.id == MatchHistory.hero_id)
+    .where(MatchHistory.created_at >= bindparam('cutoff'))
+    .group_by(Hero.id, Hero.name, _HERO_ROLE)
+    .having(func.count(MatchHistory.id) >= bindparam('min_matches'))
+    .order_by(desc('avg_performance'))
+)
+
+_ROLE_META_STMT = (
+    select(
+        _HERO_ROLE.label('role'),
+        func.avg(MatchHistory.performance_score).label('avg_performance'),
+        func.count(MatchHistory.id).label('total_matches'),
+        func.count(func.distinct(Hero.id)).label('unique_heroes')
+    )
+    .join(MatchHistory, Hero.id == MatchHistory.hero_id)
+    .where(MatchHistory.created_at >= bindparam('cutoff'))
+    .group_by(_HERO_ROLE)
+)
+
+# Hero rows and role rows of the two statements above from one scan of the
+# filtered join: role rows are the ones with grouping(Hero.id) == 1
+_META_BUNDLE_STMT = (
+    select(
+        func.grouping(Hero.id).label('is_role_row'),
+        Hero.name,
+        _HERO_ROLE.label('role'),
+        func.avg(MatchHistory.performance_score).label('avg_performance'),
+        func.count(MatchHistory.id).label('match_count'),
+        func.count(MatchHistory.id).label('total_matches'),
+        func.stddev(MatchHistory.performance_score).label('performance_std'),
+        func.min(MatchHistory.performance_score).label('min_performance'),
+        func.max(MatchHistory.performance_score).label('max_performance'),
+        func.count(func.distinct(Hero.id)).label('unique_heroes')
+    )
+    .join(MatchHistory, Hero.id == MatchHistory.hero_id)
+    .where(MatchHistory.created_at >= bindparam('cutoff'))
+    .group_by(
+        func.grouping_sets(
+            tuple_(Hero.id, Hero.name, _HERO_ROLE),
+            tuple_(_HERO_ROLE)
+        )
+    )
+    .having(
+        or_(
+            func.grouping(Hero.id) == 1,
+            func.count(MatchHistory.id) >= bindparam('min_matches')
+        )
+    )
+    .order_by(desc('avg_performance'))
+)
+
+# Counter and synergy tallies read the denormalized participant rows
+_ALLY = aliased(MatchParticipant)
+_ENEMY = aliased(MatchParticipant)
+
+# Per-ally tallies over matches with the target hero on the enemy side
+_COUNTER_STMT = (
+    select(
+        _ALLY.hero_name.label('hero'),
+        func.count().label('matches'),
+        func.sum(_ALLY.performance_score).label('total_performance')
+    )
+    .where(
+        and_(
+            _ALLY.side == 'ally',
+            _ALLY.created_at >= bindparam('cutoff'),
+            select(_ENEMY.id)
+            .where(
+                and_(
+                    _ENEMY.match_id == _ALLY.match_id,
+                    _ENEMY.side == 'enemy',
+                    _ENEMY.hero_name == bindparam('enemy')
+                )
+            )
+            .exists()
+        )
+    )
+    .group_by(_ALLY.hero_name)
+)
+
+# Per-ally tallies (excluding the hero itself) over matches the hero played
+_SYNERGY_STMT = (
+    select(
+        _ALLY.hero_name.label('ally'),
+        func.count().label('matches'),
+        func.sum(_ALLY.performance_score).label('total_performance'),
+        func.stddev_samp(_ALLY.performance_score).label('performance_std')
+    )
+    .where(
+        and_(
+            _ALLY.hero_id == bindparam('hero_id'),
+            _ALLY.side == 'ally',
+            _ALLY.created_at >= bindparam('cutoff'),
+            _ALLY.hero_name != bindparam('hero_name')
+        )
+    )
+    .group_by(_ALLY.hero_name)
+)
+
+# Cheap fingerprint of the data the reports read: changes whenever a match
+# is recorded or a hero is added/updated. Edits to existing matches and
+# deletions are not reflected (they expire with ANALYTICS_CACHE_TTL)
+_DATA_STAMP_STMT = select(
+    func.count(MatchHistory.id),
+    func.max(MatchHistory.created_at),
+    select(func.max(Hero.updated_at)).scalar_subquery()
+)
+
+# Seconds a cached report stays valid for unchanged data (see _cached)
+ANALYTICS_CACHE_TTL = 300
+
+# (method name, bound arguments, data stamp) -> (expiry time, result)
+_result_cache: Dict[Tuple[Any, ...], Tuple[float, Any]] = {}
+_result_cache_lock = threading.Lock()
+
+# Data stamp of the outermost cached call in progress, reused by the cached
+# reports it calls so a request stamps only once
+_current_stamp: contextvars.ContextVar = contextvars.ContextVar(
+    "analytics_data_stamp", default=None
+)
+
+
+def _cached(method):
+    """
+    Memoize a read-only DraftAnalytics report for ANALYTICS_CACHE_TTL
+    seconds. The key holds the arguments with defaults applied (so
+    positional, keyword and default calls share entries) and the data
+    stamp, so recording matches or adding/updating heroes invalidates it
+    straight away. Other edits and deletions can be served stale for up to
+    ANALYTICS_CACHE_TTL. Callers get a copy.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = tuple(bound.arguments.items())[1:]  # Without self
+
+        stamp = _current_stamp.get()
+        outermost = stamp is None
+        if outermost:
+            stamp = self._data_stamp()
+
+        key = (method.__name__, arguments, stamp)
+        now = time.monotonic()
+        with _result_cache_lock:
+            hit = _result_cache.get(key)
+        if hit is not None and hit[0] > now:
+            return copy.deepcopy(hit[1])
+
+        token = _current_stamp.set(stamp) if outermost else None
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            if token is not None:
+                _current_stamp.reset(token)
+
+        with _result_cache_lock:
+            for stale in [k for k, (expires, _) in _result_cache.items() if expires <= now]:
+                del _result_cache[stale]
+            _result_cache[key] = (now + ANALYTICS_CACHE_TTL, result)
+        return copy.deepcopy(result)
+
+    return wrapper
+
+
+@functools.lru_cache(maxsize=4096)
+def _consistency_score(avg_performance: float, std_dev: float) -> float:
+    """
+    Consistency score for an average/deviation pair. Module-level so the
+    cache outlives each request's DraftAnalytics; keyed on the exact
+    values, so cached scores match uncached ones.
+    """
+    if std_dev == 0:
+        return 100.0
+    
+    # Penalize high standard deviation
+    consistency = max(0, 100 - (std_dev / avg_performance * 100))
+    return round(consistency, 2)
+
+
+@dataclass(slots=True, frozen=True)
+class HeroStatRow:
+    """
+    One hero's performance stats over a period. Reports work on these
+    compact rows and convert to dicts (asdict) only in their output.
+    """
+    hero: str
+    role: Optional[str]
+    avg_performance: float
+    match_count: int
+    performance_std: float
+    min_performance: float
+    max_performance: float
+    consistency_score: float
+    
+    def asdict(self) -> Dict[str, Any]:
+        """Row as a plain dict (JSON-ready)"""
+        return asdict(self)
 
 
 class DraftAnalytics:
@@ -19,6 +242,13 @@ class DraftAnalytics:
     def __init__(self, db_session: Session):
         self.db = db_session
     
+    def _data_stamp(self) -> Tuple[Any, ...]:
+        """
+        Match count, latest match time and latest hero update (cache key part)
+        """
+        return tuple(self.db.execute(_DATA_STAMP_STMT).one())
+    
+    @_cached
     def get_hero_performance_stats(self, days: int = 30, min_matches: int = 5) -> List[Dict[str, Any]]:
         """
         Get hero performance statistics over the specified period
@@ -26,84 +256,90 @@ class DraftAnalytics:
         cutoff_date = datetime.now() - timedelta(days=days)
         
         # Query hero performance data
-        stats = (
-            self.db.query(
-                Hero.name,
-                Hero.role,
-                func.avg(MatchHistory.performance_score).label('avg_performance'),
-                func.count(MatchHistory.id).label('match_count'),
-                func.stddev(MatchHistory.performance_score).label('performance_std'),
-                func.min(MatchHistory.performance_score).label('min_performance'),
-                func.max(MatchHistory.performance_score).label('max_performance')
-            )
-            .join(MatchHistory, Hero.id == MatchHistory.hero_id)
-            .filter(MatchHistory.timestamp >= cutoff_date)
-            .group_by(Hero.id, Hero.name, Hero.role)
-            .having(func.count(MatchHistory.id) >= min_matches)
-            .order_by(desc('avg_performance'))
-            .all()
-        )
+        stats = self.db.execute(
+            _HERO_PERFORMANCE_STMT,
+            {'cutoff': cutoff_date, 'min_matches': min_matches}
+        ).all()
         
-        performance_stats = []
-        for stat in stats:
-            performance_stats.append({
-                'hero': stat.name,
-                'role': stat.role,
-                'avg_performance': round(stat.avg_performance, 2),
-                'match_count': stat.match_count,
-                'performance_std': round(stat.performance_std or 0, 2),
-                'min_performance': round(stat.min_performance, 2),
-                'max_performance': round(stat.max_performance, 2),
-                'consistency_score': self._calculate_consistency_score(
+        return [row.asdict() for row in self._performance_stats_from_rows(stats)]
+    
+    def _performance_stats_from_rows(self, stats) -> List[HeroStatRow]:
+        """
+        Shape per-hero aggregate rows into performance stats
+        """
+        return [
+            HeroStatRow(
+                hero=stat.name,
+                role=stat.role,
+                avg_performance=round(stat.avg_performance, 2),
+                match_count=stat.match_count,
+                performance_std=round(stat.performance_std or 0, 2),
+                min_performance=round(stat.min_performance, 2),
+                max_performance=round(stat.max_performance, 2),
+                consistency_score=self._calculate_consistency_score(
                     stat.avg_performance, stat.performance_std or 0
                 )
-            })
-        
-        return performance_stats
+            )
+            for stat in stats
+        ]
     
+    @_cached
     def get_role_meta_analysis(self, days: int = 30) -> Dict[str, Any]:
         """
         Analyze meta trends by role
         """
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        role_stats = (
-            self.db.query(
-                Hero.role,
-                func.avg(MatchHistory.performance_score).label('avg_performance'),
-                func.count(MatchHistory.id).label('total_matches'),
-                func.count(func.distinct(Hero.id)).label('unique_heroes')
-            )
-            .join(MatchHistory, Hero.id == MatchHistory.hero_id)
-            .filter(MatchHistory.timestamp >= cutoff_date)
-            .group_by(Hero.role)
-            .all()
-        )
+        role_stats = self.db.execute(_ROLE_META_STMT, {'cutoff': cutoff_date}).all()
         
+        return self._role_analysis_from_rows(role_stats, days)
+    
+    def _role_analysis_from_rows(self, role_stats, days: int) -> Dict[str, Any]:
+        """
+        Shape per-role aggregate rows into the role meta analysis
+        """
         meta_analysis = {
             'period_days': days,
             'roles': {},
             'summary': {}
         }
         
-        total_matches = sum(stat.total_matches for stat in role_stats)
+        # Totals and summary leaders in one pass (first role wins ties, as
+        # with max/min); pick rates need the total, so they are filled after
+        total_matches = 0
+        most_picked, most_picked_matches = None, -1
+        best_performing, best_performance = None, float('-inf')
+        most_diverse, lowest_diversity = None, float('inf')
         
         for stat in role_stats:
-            role_data = {
+            matches = stat.total_matches
+            diversity = matches / stat.unique_heroes
+            total_matches += matches
+            
+            if matches > most_picked_matches:
+                most_picked, most_picked_matches = stat.role, matches
+            if stat.avg_performance > best_performance:
+                best_performing, best_performance = stat.role, stat.avg_performance
+            if diversity < lowest_diversity:
+                most_diverse, lowest_diversity = stat.role, diversity
+            
+            meta_analysis['roles'][stat.role] = {
                 'avg_performance': round(stat.avg_performance, 2),
-                'total_matches': stat.total_matches,
+                'total_matches': matches,
                 'unique_heroes': stat.unique_heroes,
-                'pick_rate': round((stat.total_matches / total_matches) * 100, 2),
-                'diversity_score': round(stat.total_matches / stat.unique_heroes, 2)
+                'pick_rate': matches,  # Share of total_matches, set below
+                'diversity_score': round(diversity, 2)
             }
-            meta_analysis['roles'][stat.role] = role_data
+        
+        for role_data in meta_analysis['roles'].values():
+            role_data['pick_rate'] = round((role_data['pick_rate'] / total_matches) * 100, 2)
         
         # Overall summary
         meta_analysis['summary'] = {
             'total_matches': total_matches,
-            'most_picked_role': max(role_stats, key=lambda x: x.total_matches).role,
-            'best_performing_role': max(role_stats, key=lambda x: x.avg_performance).role,
-            'most_diverse_role': min(role_stats, key=lambda x: x.total_matches / x.unique_heroes).role
+            'most_picked_role': most_picked,
+            'best_performing_role': best_performing,
+            'most_diverse_role': most_diverse
         }
         
         return meta_analysis
@@ -115,53 +351,36 @@ class DraftAnalytics:
         cutoff_date = datetime.now() - timedelta(days=days)
         
         # Get matches where the hero was played
-        target_hero = self.db.query(Hero).filter(Hero.name == hero_name).first()
+        target_hero = hero_by_name(self.db, hero_name)
         if not target_hero:
             return {"error": f"Hero '{hero_name}' not found"}
         
-        # Get match data where this hero was in enemy composition
-        matches = (
-            self.db.query(MatchHistory)
-            .filter(
-                and_(
-                    MatchHistory.timestamp >= cutoff_date,
-                    MatchHistory.enemy_composition.contains(f'"{hero_name}"')
-                )
-            )
-            .all()
-        )
+        # One row per ally hero across matches where the target hero was in
+        # the enemy composition, aggregated in the database
+        rows = self.db.execute(
+            _COUNTER_STMT, {'cutoff': cutoff_date, 'enemy': hero_name}
+        ).all()
+        
+        counter_data = {
+            row.hero: {
+                'matches': row.matches,
+                'total_performance': row.total_performance,
+                'avg_performance': round(row.total_performance / row.matches, 2)
+            }
+            for row in rows
+        }
         
-        counter_data = {}
-        
-        for match in matches:
-            ally_heroes = match.get_ally_composition()
-            for ally_hero in ally_heroes:
-                if ally_hero not in counter_data:
-                    counter_data[ally_hero] = {
-                        'matches': 0,
-                        'total_performance': 0,
-                        'avg_performance': 0
-                    }
-                
-                counter_data[ally_hero]['matches'] += 1
-                counter_data[ally_hero]['total_performance'] += match.performance_score
-        
-        # Calculate averages
-        for hero, data in counter_data.items():
-            if data['matches'] > 0:
-                data['avg_performance'] = round(data['total_performance'] / data['matches'], 2)
-        
-        # Sort by effectiveness (high performance against target hero)
-        effective_counters = sorted(
-            [(hero, data) for hero, data in counter_data.items() if data['matches'] >= 3],
-            key=lambda x: x[1]['avg_performance'],
-            reverse=True
+        # Top 10 by effectiveness (high performance against target hero)
+        effective_counters = heapq.nlargest(
+            10,
+            ((hero, data) for hero, data in counter_data.items() if data['matches'] >= 3),
+            key=lambda x: x[1]['avg_performance']
         )
         
         return {
             'target_hero': hero_name,
             'analysis_period': days,
-            'effective_counters': effective_counters[:10],
+            'effective_counters': effective_counters,
             'total_matchups': len(counter_data)
         }
     
@@ -171,65 +390,39 @@ class DraftAnalytics:
         """
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        target_hero = self.db.query(Hero).filter(Hero.name == hero_name).first()
+        target_hero = hero_by_name(self.db, hero_name)
         if not target_hero:
             return {"error": f"Hero '{hero_name}' not found"}
         
-        # Get matches where this hero was played
-        matches = (
-            self.db.query(MatchHistory)
-            .filter(
-                and_(
-                    MatchHistory.hero_id == target_hero.id,
-                    MatchHistory.timestamp >= cutoff_date
-                )
-            )
-            .all()
-        )
-        
-        synergy_data = {}
+        # One row per ally (excluding the hero itself) across matches where
+        # this hero was played, aggregated in the database
+        rows = self.db.execute(
+            _SYNERGY_STMT,
+            {'hero_id': target_hero.id, 'cutoff': cutoff_date, 'hero_name': hero_name}
+        ).all()
+        
+        synergy_data = {
+            row.ally: {
+                'matches': row.matches,
+                'total_performance': row.total_performance,
+                'avg_performance': round(row.total_performance / row.matches, 2),
+                # stddev_samp is NULL for a single match
+                'performance_std': round(row.performance_std or 0.0, 2)
+            }
+            for row in rows
+        }
         
-        for match in matches:
-            ally_heroes = match.get_ally_composition()
-            # Remove the hero itself from allies
-            ally_heroes = [h for h in ally_heroes if h != hero_name]
-            
-            for ally in ally_heroes:
-                if ally not in synergy_data:
-                    synergy_data[ally] = {
-                        'matches': 0,
-                        'total_performance': 0,
-                        'avg_performance': 0,
-                        'performances': []
-                    }
-                
-                synergy_data[ally]['matches'] += 1
-                synergy_data[ally]['total_performance'] += match.performance_score
-                synergy_data[ally]['performances'].append(match.performance_score)
-        
-        # Calculate statistics
-        for ally, data in synergy_data.items():
-            if data['matches'] > 0:
-                data['avg_performance'] = round(data['total_performance'] / data['matches'], 2)
-                if len(data['performances']) > 1:
-                    data['performance_std'] = round(statistics.stdev(data['performances']), 2)
-                else:
-                    data['performance_std'] = 0.0
-                
-                # Remove raw performances to save space
-                del data['performances']
-        
-        # Best synergy partners (high performance, multiple matches)
-        best_partners = sorted(
-            [(ally, data) for ally, data in synergy_data.items() if data['matches'] >= 3],
-            key=lambda x: x[1]['avg_performance'],
-            reverse=True
+        # Top 10 synergy partners (high performance, multiple matches)
+        best_partners = heapq.nlargest(
+            10,
+            ((ally, data) for ally, data in synergy_data.items() if data['matches'] >= 3),
+            key=lambda x: x[1]['avg_performance']
         )
         
         return {
             'target_hero': hero_name,
             'analysis_period': days,
-            'best_partners': best_partners[:10],
+            'best_partners': best_partners,
             'total_partners': len(synergy_data)
         }
     
@@ -250,39 +443,42 @@ class DraftAnalytics:
         """
         Get insights for a specific player
         """
-        preferences = (
-            self.db.query(PlayerPreference)
-            .filter(PlayerPreference.player_id == player_id)
-            .all()
-        )
-        
-        if not preferences:
+        # Preferences with their hero's role, in one round-trip
+        rows = self.db.execute(
+            select(PlayerPreference, _HERO_ROLE.label('role'))
+            .join(Hero, Hero.id == PlayerPreference.hero_id)
+            .where(PlayerPreference.player_id == player_id)
+        ).all()
+        
+        if not rows:
             return {"error": f"No data found for player '{player_id}'"}
         
-        # Calculate player statistics
-        total_games = sum(pref.play_count for pref in preferences)
-        weighted_winrate = sum(pref.win_rate * pref.play_count for pref in preferences) / total_games if total_games > 0 else 0
+        preferences = [pref for pref, _ in rows]
+        
+        # Game totals and role distribution in one pass
+        total_games = 0
+        weighted_wins = 0.0
+        hero_roles = {}
+        for pref, role in rows:
+            play_count = pref.play_count
+            total_games += play_count
+            weighted_wins += pref.win_rate * play_count
+            role_data = hero_roles.get(role)
+            if role_data is None:
+                role_data = hero_roles[role] = {'games': 0, 'heroes': 0}
+            role_data['games'] += play_count
+            role_data['heroes'] += 1
+        weighted_winrate = weighted_wins / total_games if total_games > 0 else 0
         
         # Most played heroes
-        most_played = sorted(preferences, key=lambda x: x.play_count, reverse=True)[:5]
+        most_played = heapq.nlargest(5, preferences, key=lambda x: x.play_count)
         
         # Best performing heroes (min 5 games)
-        best_performing = sorted(
-            [pref for pref in preferences if pref.play_count >= 5],
-            key=lambda x: x.win_rate,
-            reverse=True
-        )[:5]
-        
-        # Role distribution
-        hero_roles = {}
-        for pref in preferences:
-            hero = self.db.query(Hero).filter(Hero.id == pref.hero_id).first()
-            if hero:
-                role = hero.role
-                if role not in hero_roles:
-                    hero_roles[role] = {'games': 0, 'heroes': 0}
-                hero_roles[role]['games'] += pref.play_count
-                hero_roles[role]['heroes'] += 1
+        best_performing = heapq.nlargest(
+            5,
+            (pref for pref in preferences if pref.play_count >= 5),
+            key=lambda x: x.win_rate
+        )
         
         return {
             'player_id': player_id,
@@ -311,27 +507,65 @@ class DraftAnalytics:
             'role_distribution': hero_roles
         }
     
+    @_cached
+    def get_meta_bundle(self, days: int = 30, min_matches: int = 5) -> Dict[str, Any]:
+        """
+        Hero performance stats and role meta analysis from a single query.
+        Same results as get_hero_performance_stats (as HeroStatRow rows)
+        and get_role_meta_analysis, for callers that need both.
+        """
+        cutoff_date = datetime.now() - timedelta(days=days)
+        
+        rows = self.db.execute(
+            _META_BUNDLE_STMT,
+            {'cutoff': cutoff_date, 'min_matches': min_matches}
+        ).all()
+        
+        hero_rows = [row for row in rows if not row.is_role_row]
+        role_rows = [row for row in rows if row.is_role_row]
+        
+        return {
+            'performance_stats': self._performance_stats_from_rows(hero_rows),
+            'role_analysis': self._role_analysis_from_rows(role_rows, days)
+        }
+    
+    @_cached
     def get_meta_trends(self, days: int = 30) -> Dict[str, Any]:
         """
         Get overall meta trends and insights
         """
-        performance_stats = self.get_hero_performance_stats(days)
-        role_analysis = self.get_role_meta_analysis(days)
-        
-        # Identify trend categories
-        s_tier = [hero for hero in performance_stats if hero['avg_performance'] >= 80 and hero['match_count'] >= 10]
-        a_tier = [hero for hero in performance_stats if 70 <= hero['avg_performance'] < 80 and hero['match_count'] >= 8]
-        rising = [hero for hero in performance_stats if hero['avg_performance'] >= 75 and hero['consistency_score'] >= 80]
+        return self._meta_trends_from_bundle(self.get_meta_bundle(days), days)
+    
+    def _meta_trends_from_bundle(self, bundle: Dict[str, Any], days: int) -> Dict[str, Any]:
+        """
+        Shape a meta bundle into tier rankings, trends and insights
+        """
+        performance_stats = bundle['performance_stats']
+        role_analysis = bundle['role_analysis']
+        
+        # Identify trend categories in one pass (stats are ordered by
+        # average performance, so each list keeps that order)
+        s_tier, a_tier, rising = [], [], []
+        for hero in performance_stats:
+            avg_performance = hero.avg_performance
+            if avg_performance >= 80 and hero.match_count >= 10:
+                s_tier.append(hero)
+            elif 70 <= avg_performance < 80 and hero.match_count >= 8:
+                a_tier.append(hero)
+            if avg_performance >= 75 and hero.consistency_score >= 80:
+                rising.append(hero)
+        
+        consistent = heapq.nlargest(5, performance_stats, key=lambda x: x.consistency_score)
         
         return {
             'analysis_period': days,
             'tier_rankings': {
-                'S': s_tier[:5],
-                'A': a_tier[:8],
+                'S': [hero.asdict() for hero in s_tier[:5]],
+                'A': [hero.asdict() for hero in a_tier[:8]],
             },
             'trending': {
-                'rising_heroes': rising[:5],
-                'consistent_performers': sorted(performance_stats, key=lambda x: x['consistency_score'], reverse=True)[:5]
+                'rising_heroes': [hero.asdict() for hero in rising[:5]],
+                'consistent_performers': [hero.asdict() for hero in consistent]
             },
             'role_meta': role_analysis,
             'insights': self._generate_meta_insights(performance_stats, role_analysis)
@@ -341,14 +575,9 @@ class DraftAnalytics:
         """
         Calculate consistency score (higher is more consistent)
         """
-        if std_dev == 0:
-            return 100.0
-        
-        # Penalize high standard deviation
-        consistency = max(0, 100 - (std_dev / avg_performance * 100))
-        return round(consistency, 2)
+        return _consistency_score(avg_performance, std_dev)
     
-    def _generate_meta_insights(self, performance_stats: List[Dict], role_analysis: Dict) -> List[str]:
+    def _generate_meta_insights(self, performance_stats: List[HeroStatRow], role_analysis: Dict) -> List[str]:
         """
         Generate textual insights about the current meta
         """
@@ -356,7 +585,7 @@ class DraftAnalytics:
         
         if performance_stats:
             top_hero = performance_stats[0]
-            insights.append(f"{top_hero['hero']} dominates the meta with {top_hero['avg_performance']}% average performance")
+            insights.append(f"{top_hero.hero} dominates the meta with {top_hero.avg_performance}% average performance")
         
         if 'summary' in role_analysis:
             best_role = role_analysis['summary']['most_picked_role']
@@ -380,12 +609,16 @@ def generate_daily_report(db_session: Session, days: int = 7) -> Dict[str, Any]:
     """
     analytics = DraftAnalytics(db_session)
     
+    # Every section derives from one bundle: a data stamp check plus (on a
+    # cache miss) a single aggregate query
+    bundle = analytics.get_meta_bundle(days)
+    
     report = {
         'report_date': datetime.now().isoformat(),
         'period': f"Last {days} days",
-        'meta_trends': analytics.get_meta_trends(days),
-        'top_performers': analytics.get_hero_performance_stats(days, min_matches=5)[:10],
-        'role_analysis': analytics.get_role_meta_analysis(days)
+        'meta_trends': analytics._meta_trends_from_bundle(bundle, days),
+        'top_performers': [hero.asdict() for hero in bundle['performance_stats'][:10]],
+        'role_analysis': copy.deepcopy(bundle['role_analysis'])  # Not shared with meta_trends
     }
     
     return report
@@ -2,15 +2,18 @@
 Script to load hero data from final_heroes.json into database
 """
 
-import json
 import sys
 from pathlib import Path
 
 # Add the app directory to the path
 sys.path.append(str(Path(__file__).parent))
 
+from app.db import json_codec
+from app.db.bulk import upsert_heroes
 from app.db.database import SessionLocal, init_db
-from app.db.models import Hero
+
+# Heroes per upsert statement while streaming the file
+UPSERT_BATCH_SIZE = 500
 
 
 def load_heroes_from_json(json_file: str = "final_heroes.json"):
@@ -20,68 +23,54 @@ def load_heroes_from_json(json_file: str = "final_heroes.json"):
     print("Initializing database...")
     init_db()
 
-    # Load JSON data
+    # Stream heroes from the JSON file
     print(f"Loading heroes from {json_file}...")
-    with open(json_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    heroes_data = data.get("heroes", [])
-    print(f"Found {len(heroes_data)} heroes in file")
 
     # Create database session
     db = SessionLocal()
 
     try:
-        added_count = 0
-        updated_count = 0
         error_count = 0
-
-        for hero_data in heroes_data:
-            try:
-                name = hero_data.get("name")
-                if not name:
-                    print(f"  ⚠ Skipping hero without name")
-                    error_count += 1
-                    continue
-
-                # Check if hero already exists
-                existing_hero = db.query(Hero).filter(Hero.name == name).first()
-
-                if existing_hero:
-                    # Update existing hero
-                    existing_hero.image = hero_data.get("image", "")
-
-                    if "stats" in hero_data:
-                        existing_hero.set_stats(hero_data["stats"])
-
-                    if "meta" in hero_data:
-                        existing_hero.set_meta(hero_data["meta"])
-
-                    updated_count += 1
-                    print(f"  ✓ Updated: {name}")
-                else:
-                    # Create new hero
-                    new_hero = Hero(name=name, image=hero_data.get("image", ""))
-
-                    if "stats" in hero_data:
-                        new_hero.set_stats(hero_data["stats"])
-
-                    if "meta" in hero_data:
-                        new_hero.set_meta(hero_data["meta"])
-
-                    db.add(new_hero)
-                    added_count += 1
-                    print(f"  ✓ Added: {name}")
-
-            except Exception as e:
-                print(
-                    f"  ✗ Error processing {hero_data.get('name', 'Unknown')}: {str(e)}"
-                )
+        hero_count = 0
+        rows = []
+        inserted = {}
+
+        def flush_rows():
+            # A hero inserted by an earlier batch stays reported as added
+            for name, is_new in upsert_heroes(db, rows).items():
+                inserted[name] = inserted.get(name, False) or is_new
+            rows.clear()
+
+        for hero_data in json_codec.iter_array(json_file, "heroes"):
+            hero_count += 1
+            name = hero_data.get("name")
+            if not name:
+                print(f"  ⚠ Skipping hero without name")
                 error_count += 1
                 continue
 
-        # Commit all changes
+            rows.append(
+                {
+                    "name": name,
+                    "image": hero_data.get("image", ""),
+                    "stats_json": hero_data.get("stats"),
+                    "meta_json": hero_data.get("meta"),
+                }
+            )
+            if len(rows) >= UPSERT_BATCH_SIZE:
+                flush_rows()
+
+        # Insert new heroes and update existing ones, one statement per
+        # batch, committed together
+        if rows:
+            flush_rows()
         db.commit()
+        print(f"Found {hero_count} heroes in file")
+
+        for name, is_new in inserted.items():
+            print(f"  ✓ {'Added' if is_new else 'Updated'}: {name}")
+        added_count = sum(inserted.values())
+        updated_count = len(inserted) - added_count
 
         print(f"\n{'='*50}")
         print(f"Summary:")
@@ -2,12 +2,12 @@
 Patch Updater Utility - Script to load new patch hero data.
 """
 
+import asyncio
 import json
 import os
 import sys
-import requests
 from typing import Dict, List, Any
-from sqlalchemy.orm import Session
+import httpx
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -16,9 +16,13 @@ load_dotenv()
 # Add parent directory to path to import app modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.db import json_codec
+from app.db.bulk import upsert_heroes
 from app.db.database import SessionLocal
-from app.db.models import Hero
-from app.schemas.hero_schema import HeroCreate, BulkHeroUpdate
+from app.schemas.hero_schema import HeroCreate
+
+# Remote patch files fetched at once by fetch_remote_patch
+FETCH_CONCURRENCY = 32
 
 
 class PatchUpdater:
@@ -52,9 +56,7 @@ class PatchUpdater:
         }
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data
+            return json_codec.load_file(file_path)
         except FileNotFoundError:
             print(f"Error: File '{file_path}' not found")
             return {}
@@ -79,7 +81,65 @@ class PatchUpdater:
         if not heroes_data:
             return {"error": "No hero data found in file"}
 
-        # Convert to HeroCreate objects
+        heroes = self._parse_heroes(heroes_data)
+
+        if not heroes:
+            return {"error": "No valid heroes found"}
+
+        return self.bulk_update_heroes(heroes, patch_version, update_mode)
+
+    def fetch_remote_patch(
+        self, urls: List[str], update_mode: str = "merge"
+    ) -> Dict[str, Any]:
+        """
+        Fetch patch files (same format as load_patch_data_from_file) from
+        several URLs concurrently and apply their heroes in one bulk update
+        """
+        patches = asyncio.run(self._fetch_all(urls))
+
+        heroes_data = [
+            hero_data for patch in patches for hero_data in patch.get("heroes", [])
+        ]
+        if not heroes_data:
+            return {"error": "No hero data found at the given URLs"}
+
+        heroes = self._parse_heroes(heroes_data)
+
+        if not heroes:
+            return {"error": "No valid heroes found"}
+
+        patch_version = next(
+            (patch["patch_version"] for patch in patches if "patch_version" in patch),
+            "unknown",
+        )
+        return self.bulk_update_heroes(heroes, patch_version, update_mode)
+
+    async def _fetch_all(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """
+        GET every URL over one connection pool, at most FETCH_CONCURRENCY
+        at a time. Failed or invalid responses are reported and skipped.
+        """
+        semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+        limits = httpx.Limits(max_connections=FETCH_CONCURRENCY)
+
+        async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+
+            async def fetch(url: str) -> Dict[str, Any]:
+                async with semaphore:
+                    try:
+                        response = await client.get(url)
+                        response.raise_for_status()
+                        return json_codec.loads(response.content)
+                    except (httpx.HTTPError, json.JSONDecodeError) as e:
+                        print(f"Error fetching patch data from '{url}': {e}")
+                        return {}
+
+            return await asyncio.gather(*(fetch(url) for url in urls))
+
+    def _parse_heroes(self, heroes_data: List[Dict[str, Any]]) -> List[HeroCreate]:
+        """
+        Convert raw hero dicts to HeroCreate objects, skipping invalid ones
+        """
         heroes = []
         for hero_data in heroes_data:
             try:
@@ -90,11 +150,7 @@ class PatchUpdater:
                     f"Error parsing hero data: {hero_data.get('name', 'unknown')}: {e}"
                 )
                 continue
-
-        if not heroes:
-            return {"error": "No valid heroes found"}
-
-        return self.bulk_update_heroes(heroes, patch_version, update_mode)
+        return heroes
 
     def bulk_update_heroes(
         self, heroes: List[HeroCreate], patch_version: str, update_mode: str = "merge"
@@ -102,59 +158,28 @@ class PatchUpdater:
         """
         Bulk update heroes in database
         """
-        updated_count = 0
-        created_count = 0
-        errors = []
-
         try:
-            for hero_data in heroes:
-                try:
-                    # Check if hero exists
-                    existing_hero = (
-                        self.db.query(Hero).filter(Hero.name == hero_data.name).first()
-                    )
-
-                    if existing_hero:
-                        # Update existing hero
-                        if update_mode == "replace" or hero_data.stats:
-                            if hero_data.stats:
-                                existing_hero.set_stats(hero_data.stats)
-
-                        if update_mode == "replace" or hero_data.meta:
-                            if hero_data.meta:
-                                existing_hero.set_meta(hero_data.meta)
-
-                        if hasattr(hero_data, "image") and hero_data.image:
-                            existing_hero.image = hero_data.image
-
-                        updated_count += 1
-                        print(f"Updated hero: {hero_data.name}")
-                    else:
-                        # Create new hero
-                        new_hero = Hero(
-                            name=hero_data.name,
-                        )
-
-                        if hero_data.stats:
-                            new_hero.set_stats(hero_data.stats)
-                        if hero_data.meta:
-                            new_hero.set_meta(hero_data.meta)
-                        if hasattr(hero_data, "image") and hero_data.image:
-                            new_hero.image = hero_data.image
-
-                        self.db.add(new_hero)
-                        created_count += 1
-                        print(f"Created hero: {hero_data.name}")
-
-                except Exception as e:
-                    error_msg = f"Error processing hero '{hero_data.name}': {str(e)}"
-                    errors.append(error_msg)
-                    print(error_msg)
-                    continue
-
-            # Commit all changes
+            # Only fields that are present are written; empty ones keep the
+            # hero's current value (new heroes get NULL)
+            rows = [
+                {
+                    "name": hero_data.name,
+                    "image": getattr(hero_data, "image", None) or None,
+                    "stats_json": hero_data.stats or None,
+                    "meta_json": hero_data.meta or None,
+                }
+                for hero_data in heroes
+            ]
+
+            # Create new heroes and update existing ones in one statement
+            inserted = upsert_heroes(self.db, rows)
             self.db.commit()
 
+            for name, is_new in inserted.items():
+                print(f"{'Created' if is_new else 'Updated'} hero: {name}")
+            created_count = sum(inserted.values())
+            updated_count = len(inserted) - created_count
+
             result = {
                 "success": True,
                 "message": "Bulk update completed",
@@ -163,9 +188,6 @@ class PatchUpdater:
                 "patch_version": patch_version,
             }
 
-            if errors:
-                result["errors"] = errors
-
             print(
                 f"Bulk update completed: {created_count} created, {updated_count} updated"
             )
@@ -223,8 +245,7 @@ class PatchUpdater:
         }
 
         try:
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(template, f, indent=4, ensure_ascii=False)
+            json_codec.write_file(output_file, template)
             print(f"Patch template created: {output_file}")
             return {"success": True, "file": output_file}
         except Exception as e:
@@ -241,10 +262,17 @@ def main():
     parser = argparse.ArgumentParser(description="DraftSensei Patch Updater")
     parser.add_argument(
         "action",
-        choices=["load-sample", "update-from-file", "create-template"],
+        choices=["load-sample", "update-from-file", "update-from-url", "create-template"],
         help="Action to perform",
     )
     parser.add_argument("--file", "-f", help="File path for patch data")
+    parser.add_argument(
+        "--url",
+        "-u",
+        action="append",
+        default=[],
+        help="Patch data URL (repeat for several files)",
+    )
     parser.add_argument(
         "--mode",
         "-m",
@@ -274,6 +302,13 @@ def main():
         result = updater.update_heroes_from_file(args.file, args.mode)
         print(f"File update result: {result}")
 
+    elif args.action == "update-from-url":
+        if not args.url:
+            print("Error: --url argument required for update-from-url action")
+            return
+        result = updater.fetch_remote_patch(args.url, args.mode)
+        print(f"Remote update result: {result}")
+
     elif args.action == "create-template":
         result = updater.create_patch_template(args.output)
         print(f"Template creation result: {result}")
@@ -1,26 +1,40 @@
-from app.db.database import SessionLocal
-from app.db.models import Hero
-import json
-
-db = SessionLocal()
+from app.services.hero_bulk import hero_bulk_fetch
 
 heroes_to_check = ['Sora', 'Lancelot', 'Fanny', 'Ling', 'Hayabusa', 'Gusion', 'Julian', 'Valentina']
 
-print("HERO COMPARISON:\n")
-for name in heroes_to_check:
-    h = db.query(Hero).filter(Hero.name == name).first()
-    if h:
-        meta = h.get_meta()
-        attrs = meta.get('attributes', {})
-        combat = attrs.get('combat', {})
-        surv = attrs.get('survivability', {})
-        power = attrs.get('power_curve', {})
-        
-        print(f"{name}:")
-        print(f"  Burst: {combat.get('burst_damage')}, Sustained: {combat.get('sustained_damage')}, DPS: {combat.get('dps')}")
-        print(f"  Anti-Squishy: {combat.get('anti_squishy')}, Anti-Tank: {combat.get('anti_tank')}")
-        print(f"  Tankiness: {surv.get('tankiness')}, Mobility: {surv.get('mobility')}")
-        print(f"  Late Game: {power.get('late_game')}, Scaling: {power.get('scaling')}")
-        print()
+# Compared attributes: field -> (category, stat) under meta["attributes"]
+COMPARED_STATS = {
+    stat: ("attributes", category, stat)
+    for category, stat in [
+        ('combat', 'burst_damage'),
+        ('combat', 'sustained_damage'),
+        ('combat', 'dps'),
+        ('combat', 'anti_squishy'),
+        ('combat', 'anti_tank'),
+        ('survivability', 'tankiness'),
+        ('survivability', 'mobility'),
+        ('power_curve', 'late_game'),
+        ('power_curve', 'scaling'),
+    ]
+}
+
+
+def main():
+    # Just the compared attributes of all heroes, as flat values in one query;
+    # printed in the order above
+    stats_by_name = hero_bulk_fetch(heroes_to_check, COMPARED_STATS)
+
+    print("HERO COMPARISON:\n")
+    for name in heroes_to_check:
+        h = stats_by_name.get(name)
+        if h:
+            print(f"{name}:")
+            print(f"  Burst: {h['burst_damage']}, Sustained: {h['sustained_damage']}, DPS: {h['dps']}")
+            print(f"  Anti-Squishy: {h['anti_squishy']}, Anti-Tank: {h['anti_tank']}")
+            print(f"  Tankiness: {h['tankiness']}, Mobility: {h['mobility']}")
+            print(f"  Late Game: {h['late_game']}, Scaling: {h['scaling']}")
+            print()
+
 
-db.close()
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,34 @@
-from app.db.database import SessionLocal
-from app.db.models import Hero
-import json
-
-db = SessionLocal()
+from app.services.hero_bulk import hero_bulk_fetch
 
 heroes_to_check = ['Obsidia', 'Sora', 'Julian', 'Kalea', 'Hilda', 'Khaleed', 
                    'Akai', 'Fredrinn', 'Baxia', 'Valentina', 'Chang\'e', 
                    'Zhuxin', 'Lancelot', 'Miya', 'Bruno']
 
-print("Hero Lane Priorities:")
-print("=" * 60)
+ROLE_FIELDS = {
+    'primary_role': ("attributes", "roles", "primary_role"),
+    'lanes': ("attributes", "roles", "lane_priority"),
+}
+
+
+def main():
+    print("Hero Lane Priorities:")
+    print("=" * 60)
+
+    # Role and lanes of all heroes in one query, extracted from meta by the
+    # database; printed in the order above
+    roles_by_name = hero_bulk_fetch(heroes_to_check, ROLE_FIELDS)
+
+    # Render every line first and write them in one go
+    lines = []
+    for name in heroes_to_check:
+        if name in roles_by_name:
+            roles = roles_by_name[name]
+            primary_role = roles['primary_role'] or 'Unknown'
+            lanes = roles['lanes'] or []
+            lines.append(f"{name:15} [{primary_role:10}]: {lanes}")
+    if lines:
+        print("\n".join(lines))
 
-for name in heroes_to_check:
-    h = db.query(Hero).filter(Hero.name == name).first()
-    if h:
-        meta = h.get_meta()
-        roles_data = meta.get('attributes', {}).get('roles', {})
-        lanes = roles_data.get('lane_priority', [])
-        primary_role = roles_data.get('primary_role', 'Unknown')
-        print(f"{name:15} [{primary_role:10}]: {lanes}")
 
-db.close()
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,7 @@ Helps validate hero data and batch update heroes for patches
 """
 
 import json
-from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List
 from datetime import datetime
 import shutil
 
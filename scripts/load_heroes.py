@@ -7,7 +7,6 @@ import json
 import logging
 import sys
 from pathlib import Path
-import os
 
 # Setup logging
 logging.basicConfig(
@@ -23,9 +22,16 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+from sqlalchemy import inspect
+
+from app.db import json_codec
+from app.db.bulk import backfill_match_participants
 from app.db.database import SessionLocal, init_db, test_connection
 from app.db.models import Hero
 
+# Heroes written per commit
+COMMIT_BATCH_SIZE = 500
+
 
 def load_heroes_from_json(file_path: str = "final_heroes.json") -> list:
     """
@@ -38,8 +44,7 @@ def load_heroes_from_json(file_path: str = "final_heroes.json") -> list:
         List of hero dictionaries
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            heroes_data = json.load(f)
+        heroes_data = json_codec.load_file(file_path)
 
         # Handle both list and dict formats
         if isinstance(heroes_data, dict):
@@ -72,7 +77,8 @@ def populate_heroes_to_db(heroes_list: list, clear_existing: bool = False) -> tu
     Returns:
         Tuple of (successful_count, failed_count)
     """
-    db = SessionLocal()
+    # Loaded heroes are reused across batch commits, so keep them unexpired
+    db = SessionLocal(expire_on_commit=False)
     successful = 0
     failed = 0
     errors = []
@@ -87,60 +93,80 @@ def populate_heroes_to_db(heroes_list: list, clear_existing: bool = False) -> tu
 
         logger.info(f"Starting to insert {len(heroes_list)} heroes...")
 
-        for idx, hero_data in enumerate(heroes_list, 1):
+        # Every existing hero in one query, instead of a lookup (and the
+        # autoflush it triggers) per hero
+        heroes_by_name = {hero.name: hero for hero in db.query(Hero)}
+        batch = []  # (idx, name) of heroes pending in the current batch
+
+        def commit_batch():
+            nonlocal successful, failed
             try:
-                # Check if hero already exists
-                hero_name = hero_data.get("name")
-                if not hero_name:
-                    logger.warning(f"  ⚠️  Skipping hero #{idx}: Missing name")
+                db.commit()
+                successful += len(batch)
+            except Exception as e:
+                db.rollback()
+                failed += len(batch)
+                for idx, hero_name in batch:
+                    # Heroes created in the failed batch were discarded
+                    hero = heroes_by_name.get(hero_name)
+                    if hero is not None and not inspect(hero).persistent:
+                        del heroes_by_name[hero_name]
+                    error_msg = f"Hero #{idx} ({hero_name}): {str(e)}"
+                    errors.append(error_msg)
+                logger.error(f"  ✗ Batch of {len(batch)} heroes failed: {e}")
+            batch.clear()
+            logger.info(f"  ✓ Processed {successful + failed} heroes...")
+
+        with db.no_autoflush:
+            for idx, hero_data in enumerate(heroes_list, 1):
+                try:
+                    hero_name = hero_data.get("name")
+                    if not hero_name:
+                        logger.warning(f"  ⚠️  Skipping hero #{idx}: Missing name")
+                        failed += 1
+                        continue
+
+                    existing = heroes_by_name.get(hero_name)
+
+                    if existing:
+                        # Update existing hero
+                        if "stats" in hero_data:
+                            existing.set_stats(hero_data.get("stats", {}))
+                        if "meta" in hero_data:
+                            existing.set_meta(hero_data.get("meta", {}))
+                        if "image" in hero_data:
+                            existing.image = hero_data.get("image")
+                    else:
+                        # Create new hero
+                        new_hero = Hero(
+                            name=hero_name,
+                            image=hero_data.get("image", ""),
+                        )
+
+                        # Set stats and meta
+                        if "stats" in hero_data:
+                            new_hero.set_stats(hero_data.get("stats", {}))
+                        if "meta" in hero_data:
+                            new_hero.set_meta(hero_data.get("meta", {}))
+
+                        db.add(new_hero)
+                        heroes_by_name[hero_name] = new_hero
+
+                    batch.append((idx, hero_name))
+                    if len(batch) >= COMMIT_BATCH_SIZE:
+                        commit_batch()
+
+                except Exception as e:
                     failed += 1
-                    continue
-
-                existing = db.query(Hero).filter(Hero.name == hero_name).first()
-
-                if existing:
-                    # Update existing hero
-                    if "stats" in hero_data:
-                        existing.set_stats(hero_data.get("stats", {}))
-                    if "meta" in hero_data:
-                        existing.set_meta(hero_data.get("meta", {}))
-                    if "image" in hero_data:
-                        existing.image = hero_data.get("image")
-
-                    db.commit()
-                    successful += 1
-
-                    if idx % 50 == 0:
-                        logger.info(f"  ✓ Processed {successful + failed} heroes...")
-                else:
-                    # Create new hero
-                    new_hero = Hero(
-                        name=hero_name,
-                        image=hero_data.get("image", ""),
+                    error_msg = (
+                        f"Hero #{idx} ({hero_data.get('name', 'Unknown')}): {str(e)}"
                     )
+                    errors.append(error_msg)
+                    logger.error(f"  ✗ {error_msg}")
+                    continue
 
-                    # Set stats and meta
-                    if "stats" in hero_data:
-                        new_hero.set_stats(hero_data.get("stats", {}))
-                    if "meta" in hero_data:
-                        new_hero.set_meta(hero_data.get("meta", {}))
-
-                    db.add(new_hero)
-                    db.commit()
-                    successful += 1
-
-                    if idx % 50 == 0:
-                        logger.info(f"  ✓ Processed {successful + failed} heroes...")
-
-            except Exception as e:
-                db.rollback()
-                failed += 1
-                error_msg = (
-                    f"Hero #{idx} ({hero_data.get('name', 'Unknown')}): {str(e)}"
-                )
-                errors.append(error_msg)
-                logger.error(f"  ✗ {error_msg}")
-                continue
+            if batch:
+                commit_batch()
 
         logger.info(f"✓ Completed: {successful} successful, {failed} failed")
 
@@ -179,6 +205,19 @@ def main():
         logger.error("✗ Failed to initialize database tables.")
         return False
 
+    # Matches recorded before match_participants existed. Only counter and
+    # synergy analytics depend on it, so a failure does not stop the load;
+    # those reports ignore old matches until a later run succeeds
+    try:
+        with SessionLocal() as db:
+            backfilled = backfill_match_participants(db)
+            db.commit()
+        if backfilled:
+            logger.info(f"✓ Backfilled {backfilled} match participant rows")
+    except Exception as e:
+        logger.warning(f"⚠️  Match participant backfill failed: {e}")
+        logger.warning("  Counter/synergy analytics will not include older matches")
+
     # Step 3: Load heroes from JSON
     logger.info("\n[3/4] Loading heroes from final_heroes.json...")
     heroes_list = load_heroes_from_json("final_heroes.json")
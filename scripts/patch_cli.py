@@ -11,7 +11,7 @@ import os
 import shutil
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Optional
 
 # ─────────────────────────────────────────────────────────────────────────────
 # SETUP